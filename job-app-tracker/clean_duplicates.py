@@ -1,6 +1,8 @@
-import json
 import os
+import orjson
 from datetime import datetime
+from functools import lru_cache
+from operator import countOf, itemgetter
 
 
 STATUS_PRIORITY = {
@@ -14,22 +16,38 @@ STATUS_PRIORITY = {
     "Declined": 5,  # Highest priority - always keep rejection records
 }
 
+# Sentinel for records without a parseable date; built once instead of a
+# fresh datetime.min.date() allocation per scored record
+_MIN_DATE = datetime.min.date()
+
 
 def count_unknown_fields(app):
     """Count the number of 'Unknown' fields in an application record."""
-    unknown_count = sum(1 for value in app.values() if value == "Unknown")
-    return unknown_count
+    # countOf runs the comparison loop in C, without a generator frame
+    return countOf(app.values(), "Unknown")
 
 
+@lru_cache(maxsize=4096)
 def parse_date(s: str):
+    # Duplicate buckets re-parse the same date strings over and over;
+    # a cache hit is a dict lookup instead of the whole strptime machinery
     try:
         return datetime.strptime(s, "%Y-%m-%d").date()
     except Exception:
         return None
 
 
+def score_record(app):
+    """Score tuple for picking the best record: priority desc, unknowns asc,
+    date desc (missing dates sort last)."""
+    prio = STATUS_PRIORITY.get(app.get("status", "Applied"), 0)
+    unknowns = count_unknown_fields(app)
+    d = parse_date(app.get("Date", ""))
+    return (prio, -unknowns, d or _MIN_DATE)
+
+
 def pick_best_record(app_list):
-    """Given a list of (idx, app) for same Company+Job Title, keep the best one.
+    """Given a list of (score, idx) for same Company+Job Title, keep the best one.
     
     Priority rules (in order):
     1. Higher STATUS_PRIORITY (Declined > Offer > Interview > Assessment > Applied)
@@ -41,26 +59,10 @@ def pick_best_record(app_list):
     
     Returns the idx to keep and a set of idxs to drop.
     """
-    # Build comparable tuples
-    scored = []
-    for idx, app in app_list:
-        status = app.get("status", "Applied")
-        prio = STATUS_PRIORITY.get(status, 0)
-        unknowns = count_unknown_fields(app)
-        d = parse_date(app.get("Date", ""))
-        scored.append((idx, app, prio, unknowns, d))
-
-    # Sort by: priority desc, unknowns asc, date desc
-    scored.sort(key=lambda x: (x[2], -x[3], x[4] or datetime.min.date()))  # temporary sort; will reorder next
-    # We actually want: priority DESC, unknowns ASC, date DESC
-    scored = sorted(scored, key=lambda x: (
-        x[2],                    # priority
-        -x[3],                   # negative unknowns for fewer first
-        (x[4] or datetime.min.date())
-    ), reverse=True)
-
-    keep_idx = scored[0][0]
-    drop_idxs = {idx for idx, *_ in scored[1:]}
+    # Scores were computed once during bucketing; one max() pass over the
+    # ready-made tuples picks the winner
+    keep_idx = max(app_list, key=itemgetter(0))[1]
+    drop_idxs = {idx for _, idx in app_list if idx != keep_idx}
     return keep_idx, drop_idxs
 
 
@@ -70,16 +72,19 @@ def clean_duplicates(filename="data/job_applications.json"):
         print("No job_applications.json found.")
         return
 
-    with open(filename, 'r') as f:
-        applications = json.load(f)
+    # orjson parses/serializes in C; stdlib json's indent path is the slowest
+    with open(filename, 'rb') as f:
+        applications = orjson.loads(f.read())
 
     print(f"Found {len(applications)} records before cleaning.")
 
     # Group applications by (Company, Job Title)
+    # Score each record once, while bucketing, so pick_best_record never
+    # re-derives priority/unknowns/date for the same entry
     buckets = {}
     for i, app in enumerate(applications):
         key = (app.get('Company', ''), app.get('Job Title', ''))
-        buckets.setdefault(key, []).append((i, app))
+        buckets.setdefault(key, []).append((score_record(app), i))
 
     to_remove = set()
 
@@ -89,15 +94,27 @@ def clean_duplicates(filename="data/job_applications.json"):
         keep, drops = pick_best_record(app_list)
         to_remove.update(drops)
 
-    # Remove in reverse order to avoid index shift
-    removed = 0
-    for idx in sorted(to_remove, reverse=True):
-        del applications[idx]
-        removed += 1
+    if not to_remove:
+        # Nothing to drop: skip the full re-serialize and leave the file's
+        # mtime alone for downstream tooling
+        print(f"No duplicates found. {len(applications)} records unchanged.")
+        return
 
-    # Save the cleaned data
-    with open(filename, 'w') as f:
-        json.dump(applications, f, indent=4)
+    # Rebuild the list in one linear pass instead of repeated del calls,
+    # each of which memmoves the tail of the list
+    applications = [a for i, a in enumerate(applications) if i not in to_remove]
+    removed = len(to_remove)
+
+    # Save the cleaned data, one record per line: serializing record by
+    # record keeps peak memory at a single entry instead of the whole
+    # encoded document
+    with open(filename, 'wb') as f:
+        f.write(b'[\n')
+        for i, app in enumerate(applications):
+            if i:
+                f.write(b',\n')
+            f.write(orjson.dumps(app))
+        f.write(b'\n]\n')
 
     print(f"Cleaned {removed} duplicate entries. Now {len(applications)} records remain.")
 
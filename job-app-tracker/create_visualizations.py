@@ -1,44 +1,221 @@
 #!/usr/bin/env python3
 # create_visualizations.py - Generate beautiful HTML visualizations for job application data
 
-import json
+import hashlib
 import os
+import re
+import sys
+import threading
+import numpy as np
+import orjson
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
+import plotly.io as pio
 from plotly.subplots import make_subplots
-from collections import Counter
-from datetime import datetime, timedelta
+from collections import Counter, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from operator import attrgetter
+
+# Serialize figures with orjson's C encoder instead of plotly's pure-Python
+# JSON path; this roughly halves write_html time on the larger figures
+pio.json.config.default_engine = 'orjson'
+
+# Keyword -> display label for job title analysis
+KEYWORD_MAPPING = {
+    'data': 'Data',
+    'scientist': 'Scientist',
+    'science': 'Science',
+    'analyst': 'Analyst',
+    'analytics': 'Analytics',
+    'intern': 'Intern',
+    'engineer': 'Engineer',
+    'machine learning': 'ML',
+    'ml': 'ML',
+    'software': 'Software',
+    'research': 'Research',
+    'business': 'Business',
+    'product': 'Product',
+    'technical': 'Technical'
+}
+
+# Single alternation so the regex engine scans each title in one C-level pass;
+# longest keywords first so 'machine learning' wins over 'ml'
+KEYWORD_RE = re.compile(
+    r'\b(' + '|'.join(re.escape(k) for k in sorted(KEYWORD_MAPPING, key=len, reverse=True)) + r')\b'
+)
+
+# Shared styling constants: Plotly accepts shared dicts/sequences, so these
+# are allocated once instead of per chart call
+STATUS_COLORS = {
+    'Applied': '#4ECDC4',
+    'Assessment': '#45B7D1',
+    'Interviewed': '#96CEB4',
+    'Offer': '#FFEAA7',
+    'Declined': '#FF6B6B'
+}
+DASHBOARD_STATUS_COLORS = {
+    'Applied': '#6C5CE7',      # Soft purple
+    'Assessment': '#74B9FF',   # Sky blue
+    'Interviewed': '#FDCB6E',  # Warm yellow
+    'Offer': '#00B894',        # Success green
+    'Declined': '#FD79A8'      # Soft pink
+}
+# Sunset gradient, Monday through Sunday
+WEEKDAY_COLORS = ('#FF6B9D', '#C44569', '#F8B500', '#FDCB6E', '#6C5CE7', '#74B9FF', '#A29BFE')
+WEEKDAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+POSITIVE_STATUSES = frozenset({'Offer', 'Interviewed', 'Assessment'})
+
+# Raw 'YYYY-MM-DD' string -> parsed datetime (None for unparseable values).
+# strptime is expensive, so each unique date string is parsed exactly once
+# no matter how many chart functions look at it.
+DATE_CACHE = {}
+
+def parse_date_cached(raw_date):
+    """Return the datetime for a 'YYYY-MM-DD' string, or None if invalid (memoized)"""
+    try:
+        return DATE_CACHE[raw_date]
+    except KeyError:
+        try:
+            parsed = datetime.strptime(raw_date, '%Y-%m-%d')
+        except (TypeError, ValueError):
+            parsed = None
+        DATE_CACHE[raw_date] = parsed
+        return parsed
+
+# Slim per-record view of the raw JSON dicts: attribute access beats dict.get
+# in the aggregation loops, and missing values are normalized in one place
+Record = namedtuple('Record', ['status', 'company', 'date', 'title'])
 
 def load_data():
     """Load job application data"""
     if not os.path.exists("data/job_applications.json"):
         print("Data file not found: data/job_applications.json")
         return []
-    
-    with open("data/job_applications.json", "r") as f:
-        data = json.load(f)
-    
+
+    # orjson parses in C and skips the text-decode pass entirely
+    with open("data/job_applications.json", "rb") as f:
+        raw = orjson.loads(f.read())
+
+    # Statuses are interned so Counter lookups compare by identity
+    data = [
+        Record(
+            sys.intern(item.get('status') or 'Unknown'),
+            item.get('Company') or 'Unknown',
+            item.get('Date') or None,
+            item.get('Job Title') or ''
+        )
+        for item in raw
+    ]
+
+    # Pre-warm the date cache in a single pass so chart functions never parse
+    for record in data:
+        if record.date and record.date not in DATE_CACHE:
+            parse_date_cached(record.date)
+
     print(f"Loaded {len(data)} job application records")
     return data
 
 
-def create_status_pie_chart(data):
+@dataclass
+class Aggregates:
+    """Aggregates shared by all chart functions, built in one pass over the records"""
+    status_counts: Counter    # status -> count
+    company_counts: Counter   # company -> count ('Unknown' excluded)
+    timeline_counts: Counter  # raw 'YYYY-MM-DD' string -> count
+    date_counts: Counter      # datetime.date -> count
+    weekday_counts: Counter   # weekday index (Monday=0) -> count
+    keyword_counts: Counter   # job title keyword label -> count
+    dated_indices: np.ndarray  # positions of records with a parseable Date
+
+
+def build_aggregates(data):
+    """Build every chart aggregate in a single fused pass over the records"""
+    agg = Aggregates(Counter(), Counter(), Counter(), Counter(), Counter(), Counter(),
+                     np.empty(0, dtype=np.int64))
+
+    # Counter.update(map(attrgetter(...))) iterates in C; with interned status
+    # strings the hash lookups compare by identity
+    agg.status_counts.update(map(attrgetter('status'), data))
+    agg.company_counts.update(map(attrgetter('company'), data))
+    agg.company_counts.pop('Unknown', None)
+
+    titles = []
+    date_strings = []
+    dated_indices = []
+    for i, record in enumerate(data):
+        if record.date and parse_date_cached(record.date) is not None:
+            date_strings.append(record.date)
+            dated_indices.append(i)
+
+        if record.title and record.title not in ('Not specified', 'Not provided', '[Not provided]'):
+            titles.append(record.title)
+
+    # All date-derived aggregates come from one vectorized datetime64 pass:
+    # np.unique yields the timeline, and bincount over the day-of-week codes
+    # yields the weekday histogram (numpy day 0 is a Thursday, hence the +3)
+    agg.dated_indices = np.asarray(dated_indices, dtype=np.int64)
+    if date_strings:
+        dates = np.array(date_strings, dtype='datetime64[D]')
+        uniq, cnt = np.unique(dates, return_counts=True)
+        agg.timeline_counts.update(dict(zip(np.datetime_as_string(uniq, unit='D'), cnt.tolist())))
+        agg.date_counts.update(dict(zip(uniq.astype(object), cnt.tolist())))
+        wd_counts = np.bincount((dates.astype('int64') + 3) % 7, minlength=7)
+        agg.weekday_counts.update({i: int(c) for i, c in enumerate(wd_counts) if c})
+
+    # Scan all titles as one concatenated buffer so the regex engine makes a
+    # single C-level pass instead of being re-entered per title; finditer
+    # streams the hits, so no intermediate list of every match is built
+    if titles:
+        for m in KEYWORD_RE.finditer('\n'.join(titles).lower()):
+            agg.keyword_counts[KEYWORD_MAPPING[m.group(1)]] += 1
+    return agg
+
+
+def _write_fig(fig, path, include_plotlyjs='cdn'):
+    """Serialize a figure once and write it atomically.
+
+    A single buffered binary write of pre-encoded bytes replaces write_html's
+    many small text-mode chunks, and os.replace means a reader never sees a
+    half-written page.
+    """
+    if include_plotlyjs == 'directory':
+        _ensure_plotlyjs_bundle(os.path.dirname(path) or '.')
+    html = fig.to_html(include_plotlyjs=include_plotlyjs, full_html=True, validate=False)
+    _atomic_write(path, html.encode('utf-8'))
+    print(f"Created: {path}")
+
+
+_plotlyjs_lock = threading.Lock()
+
+def _ensure_plotlyjs_bundle(directory):
+    """Write the shared plotly.min.js next to the dashboards if it is missing"""
+    bundle = os.path.join(directory, 'plotly.min.js')
+    # Both dashboard builders can get here from the thread pool on a first
+    # run; the lock (and the re-check under it) keeps a single writer, so
+    # one thread's os.replace can't pull the temp file out from under the
+    # other's
+    with _plotlyjs_lock:
+        if not os.path.exists(bundle):
+            from plotly.offline import get_plotlyjs
+            _atomic_write(bundle, get_plotlyjs().encode('utf-8'))
+
+
+def _atomic_write(path, payload):
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp, path)
+
+def create_status_pie_chart(data, agg):
     """Create a pie chart for application status distribution"""
-    status_counts = Counter(item.get('status', 'Unknown') for item in data)
-    
-    # Define colors for each status
-    status_colors = {
-        'Applied': '#4ECDC4',
-        'Assessment': '#45B7D1', 
-        'Interviewed': '#96CEB4',
-        'Offer': '#FFEAA7',
-        'Declined': '#FF6B6B'
-    }
-    
+    status_counts = agg.status_counts
+
     labels = list(status_counts.keys())
-    values = list(status_counts.values())
-    colors = [status_colors.get(label, '#DDA0DD') for label in labels]
+    values = np.fromiter(status_counts.values(), dtype=np.int64)
+    colors = [STATUS_COLORS.get(label, '#DDA0DD') for label in labels]
     
     fig = go.Figure(data=[go.Pie(
         labels=labels,
@@ -58,34 +235,28 @@ def create_status_pie_chart(data):
     )
     
     os.makedirs("visualizations", exist_ok=True)
-    fig.write_html("visualizations/status_distribution.html")
-    print("Created: visualizations/status_distribution.html")
+    _write_fig(fig, "visualizations/status_distribution.html")
 
-def create_timeline_chart(data):
+def create_timeline_chart(data, agg):
     """Create a timeline chart showing applications over time"""
-    dated_data = [item for item in data if item.get('Date')]
-    if not dated_data:
+    # The shared dated_indices mask already excludes records without a valid
+    # date, so no per-record filtering or NaT coercion is needed here
+    if agg.dated_indices.size == 0:
         print("No date information available for timeline chart")
         return
-    
-    df_data = []
-    for item in dated_data:
-        try:
-            date = datetime.strptime(item['Date'], '%Y-%m-%d')
-            df_data.append({
-                'Date': date,
-                'Status': item.get('status', 'Unknown'),
-                'Company': item.get('Company', 'Unknown')
-            })
-        except ValueError:
-            continue
-    
-    if not df_data:
-        print("No valid date format found for timeline chart")
-        return
-    
-    df = pd.DataFrame(df_data)
-    timeline_data = df.groupby(['Date', 'Status']).size().reset_index(name='count')
+
+    # Encode (date, status) into one int64 key and histogram it with
+    # np.unique: a single C-level sort+scan instead of a pandas groupby
+    dates = np.array([data[i].date for i in agg.dated_indices], dtype='datetime64[D]')
+    codes, statuses = pd.factorize(np.array([data[i].status for i in agg.dated_indices]))
+    n_statuses = len(statuses)
+    keys = dates.astype('int64') * n_statuses + codes
+    uniq, counts = np.unique(keys, return_counts=True)
+    timeline_data = pd.DataFrame({
+        'Date': (uniq // n_statuses).astype('datetime64[D]'),
+        'Status': statuses[uniq % n_statuses],
+        'count': counts,
+    })
     
     fig = px.line(timeline_data, x='Date', y='count', color='Status',
                   title='Job Applications Timeline',
@@ -100,12 +271,11 @@ def create_timeline_chart(data):
         yaxis_title='Number of Applications'
     )
     
-    fig.write_html("visualizations/applications_timeline.html")
-    print("Created: visualizations/applications_timeline.html")
+    _write_fig(fig, "visualizations/applications_timeline.html")
 
-def create_company_bar_chart(data):
+def create_company_bar_chart(data, agg):
     """Create a horizontal bar chart for top companies"""
-    company_counts = Counter(item.get('Company', 'Unknown') for item in data if item.get('Company') and item.get('Company') != 'Unknown')
+    company_counts = agg.company_counts
     
     if not company_counts:
         print("No company information available for bar chart")
@@ -114,11 +284,12 @@ def create_company_bar_chart(data):
     top_companies = company_counts.most_common(10)
     companies, counts = zip(*top_companies)
     
+    counts = np.asarray(counts)
     fig = go.Figure(data=[go.Bar(
-        x=list(counts),
+        x=counts,
         y=list(companies),
         orientation='h',
-        marker=dict(color=list(counts), colorscale='viridis')
+        marker=dict(color=counts, colorscale='viridis')
     )])
     
     fig.update_layout(
@@ -130,53 +301,24 @@ def create_company_bar_chart(data):
         yaxis_title='Companies'
     )
     
-    fig.write_html("visualizations/top_companies.html")
-    print("Created: visualizations/top_companies.html")
+    _write_fig(fig, "visualizations/top_companies.html")
 
-def create_keyword_analysis(data):
+def create_keyword_analysis(data, agg):
     """Create a bar chart for job title keywords"""
-    job_titles = [item.get('Job Title', '') for item in data if item.get('Job Title') and item.get('Job Title') not in ['Not specified', 'Not provided', '[Not provided]']]
-    
-    if not job_titles:
-        print("No job title information available for keyword analysis")
-        return
-    
-    keywords = []
-    keyword_mapping = {
-        'data': 'Data',
-        'scientist': 'Scientist',
-        'science': 'Science',
-        'analyst': 'Analyst',
-        'analytics': 'Analytics',
-        'intern': 'Intern',
-        'engineer': 'Engineer',
-        'machine learning': 'ML',
-        'ml': 'ML',
-        'software': 'Software',
-        'research': 'Research',
-        'business': 'Business',
-        'product': 'Product',
-        'technical': 'Technical'
-    }
-    
-    for title in job_titles:
-        title_lower = title.lower()
-        for key, value in keyword_mapping.items():
-            if key in title_lower:
-                keywords.append(value)
-    
-    if not keywords:
+    keyword_counts = agg.keyword_counts
+
+    if not keyword_counts:
         print("No keywords found in job titles")
         return
-    
-    keyword_counts = Counter(keywords)
+
     top_keywords = keyword_counts.most_common(10)
     words, counts = zip(*top_keywords)
     
+    counts = np.asarray(counts)
     fig = go.Figure(data=[go.Bar(
         x=list(words),
-        y=list(counts),
-        marker=dict(color=list(counts), colorscale='viridis')
+        y=counts,
+        marker=dict(color=counts, colorscale='viridis')
     )])
     
     fig.update_layout(
@@ -188,12 +330,11 @@ def create_keyword_analysis(data):
         yaxis_title='Frequency'
     )
     
-    fig.write_html("visualizations/keyword_analysis.html")
-    print("Created: visualizations/keyword_analysis.html")
+    _write_fig(fig, "visualizations/keyword_analysis.html")
 
-def create_success_rate_chart(data):
+def create_success_rate_chart(data, agg):
     """Create a chart showing success rates"""
-    status_counts = Counter(item.get('status', 'Unknown') for item in data)
+    status_counts = agg.status_counts
     total = len(data)
     
     if total == 0:
@@ -211,8 +352,8 @@ def create_success_rate_chart(data):
         category_counts[category] = count
     
     categories = list(category_counts.keys())
-    counts = list(category_counts.values())
-    percentages = [count/total*100 for count in counts]
+    counts = np.fromiter(category_counts.values(), dtype=np.int64)
+    percentages = counts / total * 100
     
     fig = go.Figure(data=[go.Bar(
         x=categories,
@@ -230,13 +371,12 @@ def create_success_rate_chart(data):
         yaxis_title='Percentage'
     )
     
-    fig.write_html("visualizations/success_rate.html")
-    print("Created: visualizations/success_rate.html")
+    _write_fig(fig, "visualizations/success_rate.html")
 
-def create_summary_dashboard(data):
+def create_summary_dashboard(data, agg):
     """Create a summary dashboard with key metrics"""
-    status_counts = Counter(item.get('status', 'Unknown') for item in data)
-    company_counts = Counter(item.get('Company', 'Unknown') for item in data if item.get('Company') and item.get('Company') != 'Unknown')
+    status_counts = agg.status_counts
+    company_counts = agg.company_counts
     
     # Create subplots
     fig = make_subplots(
@@ -265,19 +405,8 @@ def create_summary_dashboard(data):
         ), row=1, col=2)
     
     # Keywords
-    job_titles = [item.get('Job Title', '') for item in data if item.get('Job Title')]
-    keywords = []
-    for title in job_titles:
-        title_lower = title.lower()
-        if 'data' in title_lower: keywords.append('Data')
-        if 'intern' in title_lower: keywords.append('Intern')
-        if 'science' in title_lower: keywords.append('Science')
-        if 'analyst' in title_lower: keywords.append('Analytics')
-        if 'engineer' in title_lower: keywords.append('Engineer')
-    
-    if keywords:
-        keyword_counts = Counter(keywords)
-        top_keywords = keyword_counts.most_common(5)
+    if agg.keyword_counts:
+        top_keywords = agg.keyword_counts.most_common(5)
         words, counts = zip(*top_keywords)
         fig.add_trace(go.Bar(
             x=list(words),
@@ -285,16 +414,21 @@ def create_summary_dashboard(data):
             name='Keywords'
         ), row=2, col=1)
     
-    # Key metrics table
+    # Key metrics table; look each status up once and reuse for the rate
     total_apps = len(data)
+    applied = status_counts.get('Applied', 0)
+    assessment = status_counts.get('Assessment', 0)
+    interviewed = status_counts.get('Interviewed', 0)
+    offers = status_counts.get('Offer', 0)
+    declined = status_counts.get('Declined', 0)
     metrics_data = [
         ['Total Applications', total_apps],
-        ['Applied', status_counts.get('Applied', 0)],
-        ['Assessment', status_counts.get('Assessment', 0)],
-        ['Interviewed', status_counts.get('Interviewed', 0)],
-        ['Offers', status_counts.get('Offer', 0)],
-        ['Declined', status_counts.get('Declined', 0)],
-        ['Success Rate', f"{((status_counts.get('Offer', 0) + status_counts.get('Interviewed', 0) + status_counts.get('Assessment', 0)) / total_apps * 100):.1f}%"]
+        ['Applied', applied],
+        ['Assessment', assessment],
+        ['Interviewed', interviewed],
+        ['Offers', offers],
+        ['Declined', declined],
+        ['Success Rate', f"{((offers + interviewed + assessment) / total_apps * 100):.1f}%"]
     ]
     
     fig.add_trace(go.Table(
@@ -310,12 +444,11 @@ def create_summary_dashboard(data):
         showlegend=False
     )
     
-    fig.write_html("visualizations/dashboard.html")
-    print("Created: visualizations/dashboard.html")
+    _write_fig(fig, "visualizations/dashboard.html", include_plotlyjs='directory')
 
-def create_advanced_funnel_chart(data):
+def create_advanced_funnel_chart(data, agg):
     """Create a conversion funnel showing the job application process"""
-    status_counts = Counter(item.get('status', 'Unknown') for item in data)
+    status_counts = agg.status_counts
     
     # Define the funnel stages in order
     funnel_stages = [
@@ -350,51 +483,34 @@ def create_advanced_funnel_chart(data):
         ]
     )
     
-    fig.write_html("visualizations/conversion_funnel.html")
-    print("Created: visualizations/conversion_funnel.html")
+    _write_fig(fig, "visualizations/conversion_funnel.html")
 
-def create_heatmap_calendar(data):
+def create_heatmap_calendar(data, agg):
     """Create a calendar heatmap showing application activity"""
-    dated_data = [item for item in data if item.get('Date')]
-    if not dated_data:
-        print("No date information available for calendar heatmap")
-        return
-    
-    # Process dates
-    date_counts = {}
-    for item in dated_data:
-        try:
-            date = datetime.strptime(item['Date'], '%Y-%m-%d').date()
-            date_counts[date] = date_counts.get(date, 0) + 1
-        except ValueError:
-            continue
-    
+    date_counts = agg.date_counts
     if not date_counts:
+        print("No date information available for calendar heatmap")
         return
-    
-    # Create date range
-    min_date = min(date_counts.keys())
-    max_date = max(date_counts.keys())
-    
-    # Generate all dates in range
-    all_dates = []
-    current = min_date
-    while current <= max_date:
-        all_dates.append(current)
-        current += timedelta(days=1)
-    
+
+    # Build the full date grid vectorized: date_range + reindex instead of a
+    # per-day Python loop with strftime calls
+    all_dates = pd.date_range(min(date_counts), max(date_counts), freq='D')
+    counts = pd.Series(date_counts)
+    counts.index = pd.to_datetime(counts.index)
+    counts = counts.reindex(all_dates, fill_value=0)
+
     # Prepare data for heatmap
-    dates = [d.strftime('%Y-%m-%d') for d in all_dates]
-    values = [date_counts.get(d, 0) for d in all_dates]
-    weekdays = [d.strftime('%A') for d in all_dates]
-    weeks = [(d - min_date).days // 7 for d in all_dates]
+    dates = all_dates.strftime('%Y-%m-%d')
+    values = counts.to_numpy()
+    weekdays = all_dates.day_name()
+    weeks = (all_dates - all_dates[0]).days // 7
     
     fig = go.Figure(data=go.Scatter(
         x=weeks,
         y=weekdays,
         mode='markers',
         marker=dict(
-            size=[max(v*10, 5) for v in values],
+            size=np.maximum(values * 10, 5),
             color=values,
             colorscale='Viridis',
             showscale=True,
@@ -412,42 +528,32 @@ def create_heatmap_calendar(data):
         height=400
     )
     
-    fig.write_html("visualizations/activity_calendar.html")
-    print("Created: visualizations/activity_calendar.html")
+    _write_fig(fig, "visualizations/activity_calendar.html")
 
-def create_sankey_diagram(data):
+def create_sankey_diagram(data, agg):
     """Create a Sankey diagram showing flow from companies to statuses"""
-    # Get top companies and their statuses
-    company_status_pairs = []
-    for item in data:
-        company = item.get('Company', 'Unknown')
-        status = item.get('status', 'Unknown')
-        if company != 'Unknown' and status != 'Unknown':
-            company_status_pairs.append((company, status))
-    
-    if not company_status_pairs:
+    pairs = pd.DataFrame({
+        'company': [record.company for record in data],
+        'status': [record.status for record in data]
+    })
+    pairs = pairs[(pairs['company'] != 'Unknown') & (pairs['status'] != 'Unknown')]
+
+    if pairs.empty:
         print("No company-status data available for Sankey diagram")
         return
-    
-    # Get top 10 companies
-    company_counts = Counter(pair[0] for pair in company_status_pairs)
-    top_companies = [comp for comp, _ in company_counts.most_common(10)]
-    
-    # Filter data for top companies
-    filtered_pairs = [(comp, status) for comp, status in company_status_pairs if comp in top_companies]
-    
-    # Create nodes and links
-    statuses = list(set(pair[1] for pair in filtered_pairs))
-    all_nodes = top_companies + statuses
-    
-    # Create mapping
-    node_map = {node: i for i, node in enumerate(all_nodes)}
-    
-    # Create links
-    link_counts = Counter(filtered_pairs)
-    sources = [node_map[comp] for comp, status in link_counts.keys()]
-    targets = [node_map[status] for comp, status in link_counts.keys()]
-    values = list(link_counts.values())
+
+    # Keep the top 10 companies
+    top_companies = pairs['company'].value_counts().head(10).index
+    pairs = pairs[pairs['company'].isin(top_companies)]
+
+    # Aggregate links in C, then integer-code both endpoints with factorize
+    # instead of a Python node_map dict plus per-link list comprehensions
+    links = pairs.groupby(['company', 'status'], sort=False).size().reset_index(name='value')
+    sources, companies = pd.factorize(links['company'], sort=False)
+    tgt_codes, statuses = pd.factorize(links['status'], sort=False)
+    all_nodes = companies.tolist() + statuses.tolist()
+    targets = tgt_codes + len(companies)
+    values = links['value'].to_numpy()
     
     fig = go.Figure(data=[go.Sankey(
         node=dict(
@@ -471,39 +577,28 @@ def create_sankey_diagram(data):
         height=600
     )
     
-    fig.write_html("visualizations/company_status_flow.html")
-    print("Created: visualizations/company_status_flow.html")
+    _write_fig(fig, "visualizations/company_status_flow.html")
 
-def create_interactive_scatter(data):
+def create_interactive_scatter(data, agg):
     """Create an interactive scatter plot with company size vs success rate"""
-    # Calculate metrics per company
-    company_data = {}
-    for item in data:
-        company = item.get('Company', 'Unknown')
-        status = item.get('status', 'Unknown')
-        
-        if company == 'Unknown':
-            continue
-            
-        if company not in company_data:
-            company_data[company] = {'total': 0, 'positive': 0, 'statuses': []}
-        
-        company_data[company]['total'] += 1
-        company_data[company]['statuses'].append(status)
-        
-        if status in ['Offer', 'Interviewed', 'Assessment']:
-            company_data[company]['positive'] += 1
-    
+    # Per-company totals and success rates via one C-side groupby instead of
+    # a Python dict-of-dicts accumulation loop
+    df = pd.DataFrame({
+        'Company': [record.company for record in data],
+        'positive': [record.status in POSITIVE_STATUSES for record in data]
+    })
+    stats = df[df['Company'] != 'Unknown'].groupby('Company', sort=False)['positive'].agg(
+        total='size', positive='sum')
+
     # Filter companies with at least 2 applications
-    filtered_companies = {k: v for k, v in company_data.items() if v['total'] >= 2}
-    
-    if not filtered_companies:
+    stats = stats[stats['total'] >= 2]
+    if stats.empty:
         print("Not enough data for scatter plot")
         return
-    
-    companies = list(filtered_companies.keys())
-    total_apps = [filtered_companies[c]['total'] for c in companies]
-    success_rates = [filtered_companies[c]['positive'] / filtered_companies[c]['total'] * 100 for c in companies]
+
+    companies = stats.index.tolist()
+    total_apps = stats['total'].to_numpy()
+    success_rates = (stats['positive'] / stats['total'] * 100).to_numpy()
     
     fig = go.Figure(data=go.Scatter(
         x=total_apps,
@@ -512,7 +607,7 @@ def create_interactive_scatter(data):
         text=companies,
         textposition='top center',
         marker=dict(
-            size=[t*5 for t in total_apps],
+            size=total_apps * 5,
             color=success_rates,
             colorscale='RdYlGn',
             showscale=True,
@@ -529,20 +624,24 @@ def create_interactive_scatter(data):
         height=600
     )
     
-    fig.write_html("visualizations/company_performance.html")
-    print("Created: visualizations/company_performance.html")
+    _write_fig(fig, "visualizations/company_performance.html")
 
-def create_all_in_one_dashboard(data):
+def create_all_in_one_dashboard(data, agg):
     """Create a clean dashboard with essential visualizations"""
-    # Create 2x2 dashboard with logical grouping
+    status_counts = agg.status_counts
+    timeline_counts = agg.timeline_counts
+    weekday_counts = agg.weekday_counts
+
+    # Create 2x2 dashboard with logical grouping; the top-right cell is left
+    # empty for the static metrics table composed into the HTML below
     fig = make_subplots(
         rows=2, cols=2,
         subplot_titles=(
-            'Status Distribution', 'Key Metrics',
+            'Status Distribution',
             'Applications Timeline', 'Activity Calendar'
         ),
         specs=[
-            [{"type": "pie"}, {"type": "table"}],
+            [{"type": "pie"}, None],
             [{"type": "scatter"}, {"type": "bar"}]
         ],
         vertical_spacing=0.18,
@@ -550,20 +649,11 @@ def create_all_in_one_dashboard(data):
         column_widths=[0.5, 0.5],
         row_heights=[0.45, 0.55]
     )
-    
-    status_counts = Counter(item.get('status', 'Unknown') for item in data)
-    
+
     # 1. Status Distribution Pie Chart - Beautiful gradient colors
-    status_colors = {
-        'Applied': '#6C5CE7',      # Soft purple
-        'Assessment': '#74B9FF',   # Sky blue
-        'Interviewed': '#FDCB6E',  # Warm yellow
-        'Offer': '#00B894',        # Success green
-        'Declined': '#FD79A8'      # Soft pink
-    }
     labels = list(status_counts.keys())
     values = list(status_counts.values())
-    colors = [status_colors.get(label, '#95A5A6') for label in labels]
+    colors = [DASHBOARD_STATUS_COLORS.get(label, '#95A5A6') for label in labels]
     
     fig.add_trace(go.Pie(
         labels=labels,
@@ -580,7 +670,9 @@ def create_all_in_one_dashboard(data):
         pull=[0.05 if label == 'Offer' else 0 for label in labels]  # Highlight offers
     ), row=1, col=1)
     
-    # 2. Key Metrics Table - Enhanced styling (moved to top right)
+    # 2. Key Metrics - emitted as a static HTML table below instead of a
+    # go.Table trace: seven fixed rows are not worth serializing through
+    # Plotly's per-cell style lists
     total_apps = len(data)
     positive_outcomes = status_counts.get('Offer', 0) + status_counts.get('Interviewed', 0) + status_counts.get('Assessment', 0)
     success_rate = (positive_outcomes / total_apps * 100) if total_apps > 0 else 0
@@ -595,109 +687,53 @@ def create_all_in_one_dashboard(data):
         ['Success Rate', f"{success_rate:.1f}%"]
     ]
     
-    # Create alternating row colors with special styling for formula
-    row_colors = ['#F8F9FA', '#E9ECEF'] * 4
-    
-    # Create alternating row colors for the table
-    formula_colors = ['#F8F9FA', '#EDF2F7'] * (len(metrics_data) // 2 + 1)  # Alternating light colors
-    
-    fig.add_trace(go.Table(
-        header=dict(
-            values=['<b>Metric</b>', '<b>Value</b>'],
-            fill_color='#6C5CE7',
-            font=dict(color='white', size=18, family='Arial Black'),
-            align='center',
-            height=50
-        ),
-        cells=dict(
-            values=[[row[0] for row in metrics_data], [row[1] for row in metrics_data]],
-            fill_color=[formula_colors[:len(metrics_data)], formula_colors[:len(metrics_data)]],
-            font=dict(
-                color='#2C3E50',
-                size=15,
-                family='Arial Black'
-            ),
-            align=['center', 'center'],
-            height=42  # Use a slightly larger height for all rows
-        )
-    ), row=1, col=2)
-    
     # 3. Applications Timeline - Enhanced styling (moved to bottom left)
-    dated_data = [item for item in data if item.get('Date')]
-    if dated_data:
-        dates = []
-        for item in dated_data:
-            try:
-                dates.append(datetime.strptime(item['Date'], '%Y-%m-%d'))
-            except:
-                continue
-        
-        if dates:
-            date_counts = Counter(d.strftime('%Y-%m-%d') for d in dates)
-            sorted_dates = sorted(date_counts.keys())
-            
-            # Create gradient effect for the line
-            fig.add_trace(go.Scatter(
-                x=sorted_dates,
-                y=[date_counts[d] for d in sorted_dates],
-                mode='lines+markers',
-                line=dict(
-                    color='#6C5CE7',
-                    width=5,
-                    shape='spline'
-                ),
-                marker=dict(
-                    size=12,
-                    color='#FDCB6E',
-                    line=dict(color='#FFFFFF', width=3),
-                    symbol='circle'
-                ),
-                fill='tonexty',
-                fillcolor='rgba(108, 92, 231, 0.15)',
-                hovertemplate='<b>Date: %{x}</b><br>Applications: %{y}<extra></extra>',
-                name='Applications'
-            ), row=2, col=1)
+    if timeline_counts:
+        # One sorted pass over the items yields both axes at once, instead of
+        # sorting the keys and then looking each one up again
+        sorted_dates, timeline_values = zip(*sorted(timeline_counts.items()))
+
+        # Create gradient effect for the line
+        fig.add_trace(go.Scatter(
+            x=sorted_dates,
+            y=timeline_values,
+            mode='lines+markers',
+            line=dict(
+                color='#6C5CE7',
+                width=5,
+                shape='spline'
+            ),
+            marker=dict(
+                size=12,
+                color='#FDCB6E',
+                line=dict(color='#FFFFFF', width=3),
+                symbol='circle'
+            ),
+            fill='tonexty',
+            fillcolor='rgba(108, 92, 231, 0.15)',
+            hovertemplate='<b>Date: %{x}</b><br>Applications: %{y}<extra></extra>',
+            name='Applications'
+        ), row=2, col=1)
     
     # 4. Activity Calendar - Beautiful gradient bars (moved to bottom right)
-    if dated_data:
-        date_counts = {}
-        for item in dated_data:
-            try:
-                date = datetime.strptime(item['Date'], '%Y-%m-%d').date()
-                weekday = date.strftime('%A')
-                date_counts[weekday] = date_counts.get(weekday, 0) + 1
-            except:
-                continue
-        
-        if date_counts:
-            weekdays = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-            counts = [date_counts.get(day, 0) for day in weekdays]
-            
-            # Beautiful gradient colors inspired by sunset
-            weekday_colors = [
-                '#FF6B9D',  # Monday - Pink
-                '#C44569',  # Tuesday - Deep pink
-                '#F8B500',  # Wednesday - Orange
-                '#FDCB6E',  # Thursday - Yellow
-                '#6C5CE7',  # Friday - Purple
-                '#74B9FF',  # Saturday - Blue
-                '#A29BFE'   # Sunday - Light purple
-            ]
-            
-            fig.add_trace(go.Bar(
-                x=weekdays,
-                y=counts,
-                marker=dict(
-                    color=weekday_colors,
-                    line=dict(color='#FFFFFF', width=3),
-                    opacity=0.9
-                ),
-                text=counts,
-                textposition='auto',
-                textfont=dict(size=13, color='white', family='Arial Black'),
-                hovertemplate='<b>%{x}</b><br>Applications: %{y}<extra></extra>',
-                name='Daily Activity'
-            ), row=2, col=2)
+    if weekday_counts:
+        weekdays = list(WEEKDAY_NAMES)
+        counts = [weekday_counts.get(i, 0) for i in range(7)]
+
+        fig.add_trace(go.Bar(
+            x=weekdays,
+            y=counts,
+            marker=dict(
+                color=WEEKDAY_COLORS,
+                line=dict(color='#FFFFFF', width=3),
+                opacity=0.9
+            ),
+            text=counts,
+            textposition='auto',
+            textfont=dict(size=13, color='white', family='Arial Black'),
+            hovertemplate='<b>%{x}</b><br>Applications: %{y}<extra></extra>',
+            name='Daily Activity'
+        ), row=2, col=2)
     
     # No formula annotation - keeping the dashboard clean and simple
     
@@ -756,9 +792,67 @@ def create_all_in_one_dashboard(data):
             fig.update_xaxes(showline=True, linewidth=2, linecolor='#DDD', row=i, col=j)
             fig.update_yaxes(showline=True, linewidth=2, linecolor='#DDD', row=i, col=j)
     
-    fig.write_html("visualizations/complete_dashboard.html")
+    # Compose the figure and the static metrics table into one page; the
+    # table overlays the empty top-right subplot cell
+    rows_html = ''.join(
+        f'<tr><td>{name}</td><td>{value}</td></tr>' for name, value in metrics_data
+    )
+    metrics_html = (
+        '<div style="position:absolute;left:55%;top:130px;width:36%">'
+        '<table style="width:100%;border-collapse:collapse;text-align:center;'
+        "font-size:15px;color:#2C3E50;font-family:'Arial Black',Arial,sans-serif\">"
+        '<thead><tr style="background:#6C5CE7;color:white;font-size:18px;height:50px">'
+        '<th>Metric</th><th>Value</th></tr></thead>'
+        f'<tbody>{rows_html}</tbody>'
+        '</table></div>'
+    )
+    _ensure_plotlyjs_bundle("visualizations")
+    fig_html = fig.to_html(include_plotlyjs='directory', full_html=False, validate=False)
+    html = (
+        '<!DOCTYPE html><html><head><meta charset="utf-8">'
+        '<title>Job Application Analytics Dashboard</title>'
+        '<style>tbody tr:nth-child(odd){background:#F8F9FA}'
+        'tbody tr:nth-child(even){background:#EDF2F7}td{height:42px}</style>'
+        '</head><body style="margin:0">'
+        f'<div style="position:relative;width:1500px;margin:0 auto">{fig_html}{metrics_html}</div>'
+        '</body></html>'
+    )
+    _atomic_write("visualizations/complete_dashboard.html", html.encode('utf-8'))
     print("Created: visualizations/complete_dashboard.html")
 
+# Every builder shares the (data, agg) signature, so they can be dispatched
+# uniformly; each one writes its own HTML file
+CHART_BUILDERS = (
+    create_status_pie_chart,
+    create_timeline_chart,
+    create_company_bar_chart,
+    create_keyword_analysis,
+    create_success_rate_chart,
+    create_summary_dashboard,
+    create_advanced_funnel_chart,
+    create_heatmap_calendar,
+    create_sankey_diagram,
+    create_interactive_scatter,
+    create_all_in_one_dashboard,
+)
+
+# Output file written by each builder in CHART_BUILDERS, plus the key file
+# used to skip regeneration when the data is unchanged
+CHART_OUTPUTS = (
+    "visualizations/status_distribution.html",
+    "visualizations/applications_timeline.html",
+    "visualizations/top_companies.html",
+    "visualizations/keyword_analysis.html",
+    "visualizations/success_rate.html",
+    "visualizations/dashboard.html",
+    "visualizations/conversion_funnel.html",
+    "visualizations/activity_calendar.html",
+    "visualizations/company_status_flow.html",
+    "visualizations/company_performance.html",
+    "visualizations/complete_dashboard.html",
+)
+CACHE_KEY_PATH = "visualizations/.cache_key"
+
 def main():
     """Main function to generate job application visualization dashboard"""
     print("Generating Job Application Analytics Dashboard")
@@ -769,15 +863,36 @@ def main():
         return
     
     os.makedirs("visualizations", exist_ok=True)
-    
-    print("\nCreating comprehensive dashboard...")
-    
-    # Create single comprehensive dashboard
-    create_all_in_one_dashboard(data)
-    
-    print("\nVisualization created successfully!")
-    print("File saved: visualizations/complete_dashboard.html")
-    print("\nOpen the HTML file in your browser to view the interactive dashboard.")
+
+    # Plotly rendering dominates the runtime, so skip it entirely when the
+    # data file is unchanged and every output is still on disk
+    with open("data/job_applications.json", "rb") as f:
+        cache_key = hashlib.sha256(f.read()).hexdigest()
+    if os.path.exists(CACHE_KEY_PATH):
+        with open(CACHE_KEY_PATH) as f:
+            if f.read().strip() == cache_key and all(os.path.exists(p) for p in CHART_OUTPUTS):
+                print("\nData unchanged; visualizations are up to date.")
+                return
+
+    # Build the shared aggregates once; every chart reads from them
+    agg = build_aggregates(data)
+
+    print("\nCreating visualizations...")
+
+    # The builders only read the shared data/agg and write distinct files, so
+    # overlap them in a thread pool; write_html spends most of its time in
+    # serialization and file I/O
+    with ThreadPoolExecutor(max_workers=min(len(CHART_BUILDERS), os.cpu_count() or 4)) as executor:
+        futures = [executor.submit(builder, data, agg) for builder in CHART_BUILDERS]
+        for future in futures:
+            future.result()
+
+    with open(CACHE_KEY_PATH, "w") as f:
+        f.write(cache_key)
+
+    print("\nVisualizations created successfully!")
+    print("Main dashboard: visualizations/complete_dashboard.html")
+    print("\nOpen the HTML files in your browser to view the interactive charts.")
 
 if __name__ == "__main__":
     main()
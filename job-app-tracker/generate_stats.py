@@ -1,23 +1,78 @@
 #!/usr/bin/env python3
 # generate_stats.py - Generate job application statistics report
 
-import json
 import os
+import re
+import sys
+import ijson
 from collections import Counter
 from datetime import datetime
 
-def load_data():
-    """Load job application data"""
+# Keyword -> report label, compiled into one alternation so each job title is
+# scanned in a single C-level regex pass; longest keywords first so
+# 'machine learning' wins over 'ml'
+KEYWORD_MAPPING = {
+    'data': 'Data',
+    'scientist': 'Science',
+    'science': 'Science',
+    'analyst': 'Analytics',
+    'analytics': 'Analytics',
+    'intern': 'Intern',
+    'engineer': 'Engineer',
+    'machine learning': 'ML',
+    'ml': 'ML',
+}
+KEYWORD_RE = re.compile(
+    r'\b(' + '|'.join(re.escape(k) for k in sorted(KEYWORD_MAPPING, key=len, reverse=True)) + r')\b',
+    re.IGNORECASE
+)
+
+def iter_data():
+    """Stream job application records one at a time"""
     if not os.path.exists("data/job_applications.json"):
         print("Data file not found: data/job_applications.json")
-        return []
+        return
     
-    with open("data/job_applications.json", "r") as f:
-        return json.load(f)
+    # ijson parses incrementally, so peak memory stays at one record instead
+    # of the whole tracker; the fused loop below only needs a single pass
+    with open("data/job_applications.json", "rb") as f:
+        yield from ijson.items(f, 'item')
 
-def generate_stats(data):
+def generate_stats(records):
     """Generate statistics report based on hiring process flow"""
-    if not data:
+    # One pass over the record stream builds every aggregate at once; the
+    # iterator is consumed exactly here, so nothing is retained beyond the
+    # counters themselves
+    total_applications = 0
+    status_counts = Counter()
+    company_counts = Counter()
+    keyword_counts = Counter()
+    min_date = max_date = None
+    for item in records:
+        total_applications += 1
+        # Interning collapses the handful of distinct status strings to
+        # shared objects, so the Counter's dict probes hit on identity;
+        # `or` also catches explicit null statuses, not just missing keys
+        status_counts[sys.intern(item.get('status') or 'Unknown')] += 1
+
+        company = item.get('Company', 'Unknown')
+        if company and company != 'Unknown':
+            company_counts[company] += 1
+
+        date = item.get('Date', '')
+        if date:
+            # ISO dates compare correctly as strings
+            if min_date is None or date < min_date:
+                min_date = date
+            if max_date is None or date > max_date:
+                max_date = date
+
+        title = item.get('Job Title', '')
+        if title and title not in ['Not specified', 'Not provided', '[Not provided]']:
+            for match in KEYWORD_RE.findall(title):
+                keyword_counts[KEYWORD_MAPPING[match.lower()]] += 1
+    
+    if total_applications == 0:
         print("No data available for analysis")
         return
     
@@ -25,13 +80,8 @@ def generate_stats(data):
     print("Job Application Statistics Report")
     print("=" * 60)
     
-    # Basic statistics
-    total_applications = len(data)
     print(f"\nTotal Applications: {total_applications}")
     
-    # Status distribution with hiring process flow
-    status_counts = Counter(item.get('status', 'Unknown') for item in data)
-    
     # Define status order and descriptions
     status_info = {
         'Applied': 'Initial applications submitted',
@@ -82,48 +132,24 @@ def generate_stats(data):
         print(f"  Overall Success Rate: {offer_count}/{total_applications} ({overall_success:.1f}%)")
     
     # Company statistics (Top 5 only)
-    company_counts = Counter(item.get('Company', 'Unknown') for item in data)
     print(f"\nTop 5 Companies Applied:")
     print("-" * 40)
     for company, count in company_counts.most_common(5):
-        if company and company != 'Unknown':
-            print(f"  {company}: {count}")
+        print(f"  {company}: {count}")
     
     # Date range
-    dates = [item.get('Date', '') for item in data if item.get('Date')]
-    if dates:
+    if min_date:
         print(f"\nApplication Date Range:")
-        print(f"  Earliest: {min(dates)}")
-        print(f"  Latest: {max(dates)}")
+        print(f"  Earliest: {min_date}")
+        print(f"  Latest: {max_date}")
     
     # Job title keywords
-    job_titles = [item.get('Job Title', '') for item in data if item.get('Job Title') and item.get('Job Title') not in ['Not specified', 'Not provided', '[Not provided]']]
-    if job_titles:
-        # Extract keywords
-        keywords = []
-        for title in job_titles:
-            title_lower = title.lower()
-            if 'data' in title_lower:
-                keywords.append('Data')
-            if 'scientist' in title_lower or 'science' in title_lower:
-                keywords.append('Science')
-            if 'analyst' in title_lower or 'analytics' in title_lower:
-                keywords.append('Analytics')
-            if 'intern' in title_lower:
-                keywords.append('Intern')
-            if 'engineer' in title_lower:
-                keywords.append('Engineer')
-            if 'machine learning' in title_lower or 'ml' in title_lower:
-                keywords.append('ML')
-        
-        if keywords:
-            keyword_counts = Counter(keywords)
-            print(f"\nJob Title Keywords:")
-            for keyword, count in keyword_counts.most_common():
-                print(f"  {keyword}: {count}")
+    if keyword_counts:
+        print(f"\nJob Title Keywords:")
+        for keyword, count in keyword_counts.most_common():
+            print(f"  {keyword}: {count}")
     
     print("\n" + "=" * 60)
 
 if __name__ == "__main__":
-    data = load_data()
-    generate_stats(data)
+    generate_stats(iter_data())
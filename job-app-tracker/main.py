@@ -1,36 +1,40 @@
 # main.py
-import json
+import array
+import asyncio
+import hashlib
+import orjson
 import os
+import re
 import signal
 import sys
-import time
 import argparse
 from datetime import datetime, timedelta
-from tqdm import tqdm
-from scripts.gmail_fetch import fetch_emails, get_email_snippet, get_email_content
-from scripts.process_emails import is_job_application, classify_email
+from scripts.gmail_fetch import fetch_emails, fetch_contents_batch, BATCH_SIZE as GMAIL_BATCH_SIZE
+from scripts.process_emails import classify_emails_batch, classify_emails_batch_api
 
 # Global variables
 results = []
 interrupted = False
 processed_email_ids = set()  
 
-def normalize_status(raw_status):
-    """
-    Normalize job application status based on the hiring process flow:
-    Applied -> Assessment/Interview -> Offer/Declined
-    
-    Status hierarchy (later stages override earlier ones):
-    1. Applied (initial application)
-    2. Assessment (coding test, take-home, etc.)
-    3. Interview (phone, video, onsite)
-    4. Offer (job offer received)
-    5. Declined (rejected at any stage)
-    """
-    raw = raw_status.lower().strip()
-    
-    # Declined - highest priority (can happen at any stage)
-    declined_phrases = [
+# How many OpenAI requests may be in flight at once; the calls are
+# network-bound, so overlapping them cuts wall time until the rate limit
+OPENAI_CONCURRENCY = 8
+
+# Fetched-but-unclassified chunks allowed between the Gmail producer and
+# the classifier; a small bound gives prefetch without unbounded memory
+PIPELINE_QUEUE_DEPTH = 2
+
+def _phrase_pattern(phrases):
+    """Compile a phrase list into one substring alternation scanned in C."""
+    return re.compile('|'.join(re.escape(p) for p in phrases))
+
+# Status phrase tables, one compiled alternation per category so each call
+# makes at most one scan per category instead of one per phrase. Checked in
+# hierarchy order: later stages override earlier ones, and Declined has
+# highest priority because it can happen at any stage.
+_STATUS_PATTERNS = (
+    ("Declined", _phrase_pattern([
         "declined", "rejected", "not selected", "not moving forward", "not proceed",
         "selected other candidates", "selected individuals", "chosen other applicants",
         "decided to move forward with other candidates", "pursuing other candidates",
@@ -38,34 +42,47 @@ def normalize_status(raw_status):
         "unable to offer", "cannot offer", "will not be moving forward",
         "have filled the position", "position has been filled", "no longer considering",
         "decided not to move forward", "will not be proceeding", "not the right fit"
-    ]
-    if any(phrase in raw for phrase in declined_phrases):
-        return "Declined"
-    
-    # Offer - second highest priority
-    elif any(word in raw for word in ["offer", "accepted", "congratulations"]):
-        return "Offer"
-    
-    # Interview - third priority
-    elif any(word in raw for word in ["interview", "phone screen", "video call", "onsite", "final round"]):
-        return "Interviewed"
-    
-    # Assessment - fourth priority
-    elif any(word in raw for word in [
+    ])),
+    ("Offer", _phrase_pattern(["offer", "accepted", "congratulations"])),
+    ("Interviewed", _phrase_pattern([
+        "interview", "phone screen", "video call", "onsite", "final round"
+    ])),
+    ("Assessment", _phrase_pattern([
         "assessment", "online assessment", "oa", "coding challenge", "code challenge",
         "take-home", "take home", "test", "hackerank", "hackerrank", "codility", "karat",
         "work sample", "case study", "exercise", "assignment", "online test", "coding test",
         "take home assignment", "code exercise", "skills assessment", "technical screening",
         "online challenge", "technical assessment", "technical test", "screening test"
-    ]):
-        return "Assessment"
-    
-    # Applied - lowest priority (default)
-    elif any(word in raw for word in ["applied", "submitted", "received", "application"]):
-        return "Applied"
+    ])),
+    ("Applied", _phrase_pattern(["applied", "submitted", "received", "application"])),
+)
+
+def normalize_status(raw_status):
+    """
+    Normalize job application status based on the hiring process flow:
+    Applied -> Assessment/Interview -> Offer/Declined
     
-    else:
-        return "Applied"
+    Status hierarchy (later stages override earlier ones):
+    1. Applied (initial application)
+    2. Assessment (coding test, take-home, etc.)
+    3. Interview (phone, video, onsite)
+    4. Offer (job offer received)
+    5. Declined (rejected at any stage)
+    """
+    raw = raw_status.lower().strip()
+    for status, pattern in _STATUS_PATTERNS:
+        if pattern.search(raw):
+            return status
+    return "Applied"
+
+# One multiline pattern pulls every field out of the classification in a
+# single pass instead of splitlines plus four startswith checks per line.
+# Horizontal whitespace only: under MULTILINE a \s would cross the newline
+# on an empty value and swallow the next field's line
+_DETAIL_RE = re.compile(
+    r'^[ \t]*(Company|Job Title|Location|Status)[ \t]*:[ \t]*(.*?)[ \t]*$',
+    re.IGNORECASE | re.MULTILINE
+)
 
 def parse_classification_details(classification):
     details = {
@@ -75,59 +92,184 @@ def parse_classification_details(classification):
         "status": "",
         "Date": ""
     }
-    for line in classification.splitlines():
-        line = line.strip()
-        if line.lower().startswith("company:"):
-            details["Company"] = line.split(":", 1)[1].strip()
-        elif line.lower().startswith("job title:"):
-            details["Job Title"] = line.split(":", 1)[1].strip()
-        elif line.lower().startswith("location:"):
-            details["Location"] = line.split(":", 1)[1].strip()
-        elif line.lower().startswith("status:"):
-            raw_status = line.split(":", 1)[1].strip()
-            details["status"] = normalize_status(raw_status)
+    for match in _DETAIL_RE.finditer(classification):
+        field = match.group(1).lower()
+        value = match.group(2)
+        if field == "company":
+            details["Company"] = value
+        elif field == "job title":
+            details["Job Title"] = value
+        elif field == "location":
+            details["Location"] = value
+        elif field == "status":
+            details["status"] = normalize_status(value)
     return details
 
+# Append-only checkpoint logs: during a run each new record/ID costs one
+# appended line instead of a full rewrite of the consolidated JSON, which
+# made checkpointing O(N^2) bytes over a long backlog. The logs are folded
+# back into the base files (and removed) on clean exit or interrupt.
+RESULTS_LOG = "data/job_applications.jsonl"
+IDS_LOG = "data/processed_ids.jsonl"
+
+def _id_hash(msg_id):
+    """64-bit hash of a Gmail message ID.
+
+    Storing hashes instead of the full ID strings shrinks the processed-ids
+    file by an order of magnitude; collisions at 64 bits are negligible for
+    de-duplication purposes.
+    """
+    return int.from_bytes(hashlib.blake2b(msg_id.encode(), digest_size=8).digest(), 'big')
+
+def append_checkpoint(path, obj):
+    os.makedirs("data", exist_ok=True)
+    with open(path, "ab") as f:
+        f.write(orjson.dumps(obj) + b"\n")
+        f.flush()
+
+def load_checkpoint_log(path):
+    if not os.path.exists(path):
+        return []
+    entries = []
+    with open(path, "rb") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entries.append(orjson.loads(line))
+            except orjson.JSONDecodeError:
+                # A torn final line after a crash is expected; skip it
+                continue
+    return entries
+
+def compact_checkpoints():
+    """Fold the append logs into the consolidated files and clear them."""
+    save_results()
+    save_processed_ids(processed_email_ids)
+    for path in (RESULTS_LOG, IDS_LOG):
+        if os.path.exists(path):
+            os.remove(path)
+
 def save_results(filename="data/job_applications.json"):
     os.makedirs("data", exist_ok=True)
     # Create a copy of results without email_id
     results_to_save = [{k: v for k, v in r.items() if k != "email_id"} for r in results]
-    with open(filename, "w") as f:
-        json.dump(results_to_save, f, indent=4)
+    # orjson serializes in C; stdlib json's indent path is the slowest part
+    with open(filename, "wb") as f:
+        f.write(orjson.dumps(results_to_save, option=orjson.OPT_INDENT_2))
     print(f"Saved {len(results_to_save)} records to {filename}")
 
 def load_existing_results(filename="data/job_applications.json"):
     if os.path.exists(filename):
         try:
-            with open(filename, "r") as f:
+            with open(filename, "rb") as f:
                 content = f.read().strip()
-                if not content:
-                    return []
-                return json.loads(content)
-        except json.JSONDecodeError as e:
+                existing = orjson.loads(content) if content else []
+        except orjson.JSONDecodeError as e:
             print(f"Error reading {filename}: {e}")
-            return []
-    return []
+            existing = []
+    else:
+        existing = []
+    # Replay any records checkpointed after the last compaction
+    existing.extend(load_checkpoint_log(RESULTS_LOG))
+    return existing
 
-def save_processed_ids(ids, filename="data/processed_ids.json"):
+def save_processed_ids(ids, filename="data/processed_ids.bin"):
     os.makedirs("data", exist_ok=True)
-    with open(filename, "w") as f:
-        json.dump(list(ids), f)
+    # Fixed-width binary: 8 bytes per ID instead of a quoted JSON string
+    with open(filename, "wb") as f:
+        array.array('Q', sorted(ids)).tofile(f)
     print(f"Saved {len(ids)} processed IDs")
 
-def load_processed_ids(filename="data/processed_ids.json"):
+def load_processed_ids(filename="data/processed_ids.bin",
+                       legacy_filename="data/processed_ids.json"):
+    ids = set()
     if os.path.exists(filename):
+        with open(filename, "rb") as f:
+            raw = f.read()
+        hashes = array.array('Q')
+        hashes.frombytes(raw[:len(raw) - len(raw) % 8])
+        ids = set(hashes)
+    elif os.path.exists(legacy_filename):
+        # One-time migration from the old JSON list of ID strings
         try:
-            with open(filename, "r") as f:
+            with open(legacy_filename, "rb") as f:
                 content = f.read().strip()
-                if not content:
-                    return set()
-                return set(json.loads(content))
-        except json.JSONDecodeError as e:
-            print(f"Error reading {filename}: {e}")
-            return set()
-    return set()
+            if content:
+                ids = {_id_hash(msg_id) for msg_id in orjson.loads(content)}
+        except orjson.JSONDecodeError as e:
+            print(f"Error reading {legacy_filename}: {e}")
+    ids.update(load_checkpoint_log(IDS_LOG))
+    return ids
+
+
+def _record_classifications(msg_ids, contents, classification_list):
+    """Checkpoint one chunk of classifications; returns records added."""
+    added = 0
+    for msg_id, classification in zip(msg_ids, classification_list):
+        if classification is None:
+            continue
+        id_hash = _id_hash(msg_id)
+        processed_email_ids.add(id_hash)
+        append_checkpoint(IDS_LOG, id_hash)
+        
+        if "not job application" in classification.lower():
+            continue
+        
+        details = parse_classification_details(classification)
+        details["Date"] = contents[msg_id]["date"]
+        details["email_id"] = msg_id  # Keep internally
+        
+        if details["Company"] or details["Job Title"] or details["Location"] or details["status"]:
+            print("Extracted Details:")
+            print(f"Email ID: {details['email_id']}")
+            print(f"Company: {details['Company']}")
+            print(f"Job Title: {details['Job Title']}")
+            print(f"Location: {details['Location']}")
+            print(f"Status: {details['status']}")
+            print(f"Date: {details['Date']}")
+            print("-" * 40)
+            results.append(details)
+            added += 1
+            # One appended line checkpoints the record; the consolidated
+            # files are only rewritten at exit
+            append_checkpoint(RESULTS_LOG, {k: v for k, v in details.items() if k != "email_id"})
+    return added
 
+async def _classify_pipeline(pending_ids):
+    """Overlap Gmail content fetches with OpenAI classification.
+
+    A producer pulls one GMAIL_BATCH_SIZE chunk at a time in a worker
+    thread while the consumer classifies the previous chunk and writes
+    its checkpoints, so the two API-bound stages run concurrently and
+    wall time tends toward the slower stage instead of their sum. The
+    bounded queue provides backpressure.
+    """
+    queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_DEPTH)
+    loop = asyncio.get_running_loop()
+
+    async def producer():
+        for start in range(0, len(pending_ids), GMAIL_BATCH_SIZE):
+            chunk = pending_ids[start:start + GMAIL_BATCH_SIZE]
+            contents = await loop.run_in_executor(None, fetch_contents_batch, chunk)
+            await queue.put((chunk, contents))
+        await queue.put(None)
+
+    async def consumer():
+        added = 0
+        while (item := await queue.get()) is not None:
+            chunk, contents = item
+            fetched_ids = [msg_id for msg_id in chunk if msg_id in contents]
+            classification_list = await classify_emails_batch(
+                [contents[msg_id]["content"] for msg_id in fetched_ids],
+                concurrency=OPENAI_CONCURRENCY
+            )
+            added += _record_classifications(fetched_ids, contents, classification_list)
+        return added
+
+    _, added = await asyncio.gather(producer(), consumer())
+    return added
 
 def parse_args():
     """Parse command line arguments"""
@@ -136,17 +278,19 @@ def parse_args():
     parser.add_argument("--until", type=str, help="End date (YYYY-MM-DD)")
     parser.add_argument("--days", type=int, help="Number of days back from today")
     parser.add_argument("--limit", type=int, help="Maximum number of emails to process")
+    parser.add_argument("--batch-api", action="store_true",
+                        help="Classify via the OpenAI Batch API (half price, up to 24h turnaround)")
     return parser.parse_args()
 
 def signal_handler(sig, frame):
     global interrupted
     interrupted = True
     print("\nInterrupt received, saving progress...")
-    save_results()
-    save_processed_ids(processed_email_ids)
+    compact_checkpoints()
     sys.exit(0)
 
-def process_all_emails(limit=None, since_hours=None, since_date=None, until_date=None):
+def process_all_emails(limit=None, since_hours=None, since_date=None, until_date=None,
+                       use_batch_api=False):
     global results, interrupted, processed_email_ids
     signal.signal(signal.SIGINT, signal_handler)
     
@@ -155,103 +299,44 @@ def process_all_emails(limit=None, since_hours=None, since_date=None, until_date
     processed_email_ids = load_processed_ids()
     print(f"Loaded {len(results)} existing records, {len(processed_email_ids)} processed IDs")
     
-    # Convert date parameters to since_hours if needed
-    if since_date or until_date:
-        if since_date:
-            since_dt = datetime.strptime(since_date, '%Y-%m-%d')
-            since_hours = int((datetime.now() - since_dt).total_seconds() / 3600)
-            print(f"Searching emails since: {since_date} ({since_hours} hours ago)")
-        if until_date:
-            until_dt = datetime.strptime(until_date, '%Y-%m-%d')
-            until_hours = int((datetime.now() - until_dt).total_seconds() / 3600)
-            print(f"Searching emails until: {until_date} ({until_hours} hours ago)")
-            # Note: Gmail API doesn't directly support "until" date, 
-            # so we'll filter after fetching
+    # Convert date parameters to since_hours if needed; the until bound is
+    # pushed into the Gmail search query itself, so no post-filtering (and
+    # no per-message API calls) happens client-side
+    if since_date:
+        since_dt = datetime.strptime(since_date, '%Y-%m-%d')
+        since_hours = int((datetime.now() - since_dt).total_seconds() / 3600)
+        print(f"Searching emails since: {since_date} ({since_hours} hours ago)")
+    if until_date:
+        print(f"Searching emails until: {until_date}")
     
-    messages = fetch_emails(since_hours=since_hours)
+    messages = fetch_emails(since_hours=since_hours, until_date=until_date)
     
-    # Filter by until_date if specified
-    if until_date:
-        until_dt = datetime.strptime(until_date, '%Y-%m-%d')
-        filtered_messages = []
-        for msg in messages:
-            # Get email date and compare
-            email_data = get_email_snippet(msg['id'])  # This is lightweight
-            # Note: We'll need to implement date filtering in gmail_fetch.py
-            # For now, we'll process all and filter during processing
-        messages = filtered_messages if 'filtered_messages' in locals() else messages
+    # Drop already-processed messages up front so the batch fetches only
+    # cover new mail
+    pending_ids = [msg['id'] for msg in messages
+                   if _id_hash(msg['id']) not in processed_email_ids]
+    print(f"Processing {len(pending_ids)} emails ({len(messages) - len(pending_ids)} already done)...")
     
-    print(f"Processing {len(messages)} emails...")
+    if limit is not None and len(pending_ids) > limit:
+        print(f"Limiting to {limit} of {len(pending_ids)} emails.")
+        pending_ids = pending_ids[:limit]
     
-    processed = 0
-    # Create progress bar
-    with tqdm(total=len(messages), desc="Processing emails", unit="email") as pbar:
-        for msg in messages:
-            if interrupted:
-                break
-            
-            msg_id = msg['id']
-            if msg_id in processed_email_ids:
-                pbar.update(1)
-                continue
-            
-            if limit is not None and processed >= limit:
-                print("Reached processing limit. Stopping.")
-                break
-            
-            snippet = get_email_snippet(msg_id)
-            # Add much longer delay to reduce API call frequency
-            time.sleep(3.0)  # 3 second delay between Gmail API calls
-            
-            if not is_job_application(snippet):
-                processed_email_ids.add(msg_id)
-                time.sleep(1.0)  # Delay even for rejected emails
-                pbar.update(1)
-                continue
-            
-            email_data = get_email_content(msg_id)
-            content = email_data["content"]
-            email_date = email_data["date"]
-            
-            # Add much longer delay before OpenAI API call
-            time.sleep(3.0)  # 3 second delay before OpenAI call to avoid overload
-            
-            classification = classify_email(content)
-            processed_email_ids.add(msg_id)
-            
-            # Add longer delay after processing each email
-            time.sleep(2.0)  # 2 second delay after processing
-            
-            if "not job application" in classification.lower():
-                pbar.update(1)
-                continue
-            
-            details = parse_classification_details(classification)
-            details["Date"] = email_date
-            details["email_id"] = msg_id  # Keep internally
-            
-            if details["Company"] or details["Job Title"] or details["Location"] or details["status"]:
-                tqdm.write("Extracted Details:")
-                tqdm.write(f"Email ID: {details['email_id']}")
-                tqdm.write(f"Company: {details['Company']}")
-                tqdm.write(f"Job Title: {details['Job Title']}")
-                tqdm.write(f"Location: {details['Location']}")
-                tqdm.write(f"Status: {details['status']}")
-                tqdm.write(f"Date: {details['Date']}")
-                tqdm.write("-" * 40)
-                results.append(details)
-                processed += 1
-                
-                if processed % 10 == 0:
-                    save_results()
-                    save_processed_ids(processed_email_ids)
-            
-            # Update progress bar
-            pbar.update(1)
+    if use_batch_api:
+        # The Batch API turns around in hours, so prefetching the next
+        # Gmail chunk buys nothing; fetch everything, submit, record
+        contents = fetch_contents_batch(pending_ids)
+        fetched_ids = [msg_id for msg_id in pending_ids if msg_id in contents]
+        print(f"Classifying {len(fetched_ids)} emails via the Batch API...")
+        classification_list = classify_emails_batch_api(
+            [contents[msg_id]["content"] for msg_id in fetched_ids]
+        )
+        processed = _record_classifications(fetched_ids, contents, classification_list)
+    else:
+        print(f"Classifying {len(pending_ids)} emails in a fetch/classify pipeline...")
+        processed = asyncio.run(_classify_pipeline(pending_ids))
     
     if not interrupted:
-        save_results()
-        save_processed_ids(processed_email_ids)
+        compact_checkpoints()
     
     return results
 
@@ -282,9 +367,9 @@ if __name__ == '__main__':
             limit=args.limit, 
             since_hours=since_hours,
             since_date=since_date,
-            until_date=until_date
+            until_date=until_date,
+            use_batch_api=args.batch_api
         )
     except Exception as e:
         print(f"Unexpected error: {e}")
-        save_results()
-        save_processed_ids(processed_email_ids)
\ No newline at end of file
+        compact_checkpoints()
\ No newline at end of file
@@ -3,8 +3,6 @@
 
 import os
 import sys
-import subprocess
-import time
 from datetime import datetime
 
 def reset_data():
@@ -16,6 +14,7 @@ def reset_data():
     data_files = [
         "data/job_applications.json",
         "data/processed_ids.json",
+        "data/processed_ids.bin",
         "data/job_applications.csv",
         "visualizations/status_distribution.html"
     ]
@@ -35,53 +34,48 @@ def reset_data():
     print(f"Reset completed. Removed {removed_count} files.")
     return True
 
-def run_command(command, description):
-    """Run a command and handle errors"""
+def run_step(step_fn, description):
+    """Run one pipeline stage in-process and handle errors"""
     print(f"\n{'='*60}")
     print(f"{description}")
     print(f"{'='*60}")
-    print(f"Running: {command}")
     print()  # Add blank line for better readability
     
     try:
-        # Change to the correct directory
-        os.chdir("/Users/mac/Desktop/Job Tracker/Tracker/job-app-tracker")
-        
-        # Run the command with real-time output
-        process = subprocess.Popen(
-            command, 
-            shell=True, 
-            stdout=subprocess.PIPE, 
-            stderr=subprocess.STDOUT,
-            universal_newlines=True,
-            bufsize=1
-        )
-        
-        # Print output in real-time
-        output_lines = []
-        while True:
-            output = process.stdout.readline()
-            if output == '' and process.poll() is not None:
-                break
-            if output:
-                print(output.strip())
-                output_lines.append(output.strip())
-        
-        # Wait for process to complete
-        return_code = process.poll()
-        
-        if return_code == 0:
-            print(f"\n{description} completed successfully")
-        else:
-            print(f"\n{description} failed with return code {return_code}")
-            return False
-            
+        step_fn()
     except Exception as e:
         print(f"Error running {description}: {e}")
         return False
     
+    print(f"\n{description} completed successfully")
     return True
 
+
+# Each stage imports its module lazily inside the step function, so heavy
+# imports (pandas, plotly, openai) are paid once per run instead of once
+# per spawned interpreter, and a stage that cannot import only fails itself.
+
+def step_extract():
+    from main import process_all_emails
+    process_all_emails()
+
+def step_clean():
+    from clean_duplicates import clean_duplicates
+    clean_duplicates()
+
+def step_export():
+    from print_table import run as print_table_run
+    print_table_run(output="data/job_applications.csv")
+
+def step_stats():
+    from generate_stats import generate_stats, iter_data
+    generate_stats(iter_data())
+
+def step_visualize():
+    from create_visualizations import main as create_visualizations_main
+    create_visualizations_main()
+
+
 def main():
     """Main pipeline execution"""
     start_time = datetime.now()
@@ -89,41 +83,30 @@ def main():
     print("Job Application Data Processing Pipeline")
     print(f"Started at: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
     
+    # The stages use paths relative to the package directory
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    
     # Reset data first
     if not reset_data():
         print("Failed to reset data. Stopping pipeline.")
         return False
     
-    # Pipeline steps
+    # Pipeline steps, each a plain function call in this process instead of
+    # a freshly spawned interpreter
     steps = [
-        {
-            "command": "python job-app-tracker/main.py",
-            "description": "STEP 1: Extract job application data from Gmail"
-        },
-        {
-            "command": "python job-app-tracker/clean_duplicates.py",
-            "description": "STEP 2: Clean duplicate records"
-        },
-        {
-            "command": "python job-app-tracker/print_table.py --output data/job_applications.csv",
-            "description": "STEP 3: Export cleaned data to CSV"
-        },
-        {
-            "command": "python job-app-tracker/generate_stats.py",
-            "description": "STEP 4: Generate statistics report"
-        },
-        {
-            "command": "python job-app-tracker/create_visualizations.py",
-            "description": "STEP 5: Create status distribution visualization"
-        }
+        (step_extract, "STEP 1: Extract job application data from Gmail"),
+        (step_clean, "STEP 2: Clean duplicate records"),
+        (step_export, "STEP 3: Export cleaned data to CSV"),
+        (step_stats, "STEP 4: Generate statistics report"),
+        (step_visualize, "STEP 5: Create status distribution visualization"),
     ]
     
     # Execute each step
     success_count = 0
-    for i, step in enumerate(steps, 1):
+    for i, (step_fn, description) in enumerate(steps, 1):
         step_start_time = datetime.now()
         
-        if run_command(step["command"], step["description"]):
+        if run_step(step_fn, description):
             step_end_time = datetime.now()
             step_duration = step_end_time - step_start_time
             success_count += 1
@@ -134,8 +117,6 @@ def main():
             print(f"Status: SUCCESS")
             print(f"Duration: {step_duration}")
             print(f"Completed at: {step_end_time.strftime('%H:%M:%S')}")
-            
-            time.sleep(1)  # Brief pause between steps
         else:
             step_end_time = datetime.now()
             step_duration = step_end_time - step_start_time
@@ -1,9 +1,10 @@
 # print_table.py
 import argparse
-import json
 import os
 from datetime import datetime
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv
 
 DATA_PATH = os.path.join("data", "job_applications.json")
 
@@ -28,36 +29,37 @@ def parse_args():
 def load_data(path: str) -> pd.DataFrame:
     if not os.path.exists(path):
         raise FileNotFoundError(f"Data file not found: {path}. Run main.py first to generate it.")
-    with open(path, "r") as f:
-        data = json.load(f)
-    # Normalize to DataFrame
-    df = pd.DataFrame(data)
+    # Arrow-backed columns: strings land in contiguous buffers instead of
+    # per-row Python objects, so the .str filters below run in C and memory
+    # scales with characters rather than PyObject headers.
+    # convert_dates=False keeps the Date column as plain strings - the name
+    # matches pandas' date heuristic, which would turn every output format
+    # into '2025-07-26 00:00:00'; _Date below is the parsed copy
+    df = pd.read_json(path, dtype_backend="pyarrow", convert_dates=False)
     # Ensure expected columns exist
     for col in ["Company", "Job Title", "Location", "status", "Date"]:
         if col not in df.columns:
             df[col] = ""
-    # Parse date for sorting/filtering
-    def parse_date(s):
-        try:
-            return datetime.strptime(s, "%Y-%m-%d").date()
-        except Exception:
-            return None
-    df["_Date"] = df["Date"].apply(parse_date)
+    # Parse dates for sorting/filtering in one vectorized pass; bad values
+    # become NaT instead of raising
+    df["_Date"] = pd.to_datetime(df["Date"], format="%Y-%m-%d", errors="coerce").dt.date
     return df
 
 
 def apply_filters(df: pd.DataFrame, status_list, since, until) -> pd.DataFrame:
-    out = df.copy()
+    # All filters accumulate into one boolean mask and the frame is indexed
+    # exactly once; each intermediate out[...] step was a full row copy
+    mask = pd.Series(True, index=df.index)
     if status_list:
-        status_set = {s.strip().capitalize() for s in status_list}
-        out = out[out["status"].str.capitalize().isin(status_set)]
-    if since:
-        since_d = datetime.strptime(since, "%Y-%m-%d").date()
-        out = out[(out["_Date"].notna()) & (out["_Date"] >= since_d)]
-    if until:
-        until_d = datetime.strptime(until, "%Y-%m-%d").date()
-        out = out[(out["_Date"].notna()) & (out["_Date"] <= until_d)]
-    return out
+        status_set = {s.strip().lower() for s in status_list}
+        mask &= df["status"].str.lower().isin(status_set)
+    if since or until:
+        mask &= df["_Date"].notna()
+        if since:
+            mask &= df["_Date"] >= datetime.strptime(since, "%Y-%m-%d").date()
+        if until:
+            mask &= df["_Date"] <= datetime.strptime(until, "%Y-%m-%d").date()
+    return df.loc[mask]
 
 
 def sort_and_limit(df: pd.DataFrame, limit: int | None) -> pd.DataFrame:
@@ -80,7 +82,8 @@ def save_output(df: pd.DataFrame, out_path: str):
             f.write(df.to_markdown(index=False))
         print(f"Saved markdown table to {out_path}")
     elif ext == ".csv":
-        df.to_csv(out_path, index=False)
+        # Arrow's C++ CSV writer skips pandas' per-cell Python formatting
+        pa.csv.write_csv(pa.Table.from_pandas(df, preserve_index=False), out_path)
         print(f"Saved CSV to {out_path}")
     elif ext in (".xlsx", ".xls"):
         df.to_excel(out_path, index=False)
@@ -89,11 +92,11 @@ def save_output(df: pd.DataFrame, out_path: str):
         raise ValueError("Unsupported extension. Use .md, .csv, or .xlsx")
 
 
-def main():
-    args = parse_args()
+def run(status=None, since=None, until=None, limit=None, output=None):
+    """Programmatic entry point, also used by pipeline.py to run in-process"""
     df = load_data(DATA_PATH)
-    df = apply_filters(df, args.status, args.since, args.until)
-    df = sort_and_limit(df, args.limit)
+    df = apply_filters(df, status, since, until)
+    df = sort_and_limit(df, limit)
     df = select_columns(df)
 
     # Print to console nicely
@@ -104,8 +107,14 @@ def main():
         print(df.to_string(index=False))
 
     # Optional save
-    if args.output:
-        save_output(df, args.output)
+    if output:
+        save_output(df, output)
+
+
+def main():
+    args = parse_args()
+    run(status=args.status, since=args.since, until=args.until,
+        limit=args.limit, output=args.output)
 
 
 if __name__ == "__main__":
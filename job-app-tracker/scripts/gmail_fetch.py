@@ -36,7 +36,7 @@ def get_gmail_service():
     return build('gmail', 'v1', credentials=creds)
 
 
-def fetch_emails(since_hours=1):
+def fetch_emails(since_hours=1, until_date=None):
     service = get_gmail_service()
     
     # Ultra-minimal filtering strategy:
@@ -58,6 +58,11 @@ def fetch_emails(since_hours=1):
     if since_hours is not None:
         time_threshold = (datetime.now() - timedelta(hours=since_hours)).strftime('%Y/%m/%d')
         query_parts.append(f"after:{time_threshold}")
+    if until_date is not None:
+        # Server-side date filtering; 'before:' is exclusive, so bump one day
+        # to keep until_date itself in range
+        until_threshold = (datetime.strptime(until_date, '%Y-%m-%d') + timedelta(days=1)).strftime('%Y/%m/%d')
+        query_parts.append(f"before:{until_threshold}")
     
     # Add exclude filters only
     for ex in excludes:
@@ -94,6 +99,10 @@ def get_email_snippet(message_id):
 def get_email_content(message_id):
     service = get_gmail_service()
     message = service.users().messages().get(userId='me', id=message_id, format='full').execute()
+    return _extract_content(message)
+
+def _extract_content(message):
+    """Pull the text body, headers and date out of a full-format message."""
     payload = message.get('payload', {})
     parts = payload.get('parts', [])
     body = ""
@@ -118,4 +127,65 @@ def get_email_content(message_id):
     internal_date = int(message.get('internalDate', 0)) / 1000
     email_date = datetime.fromtimestamp(internal_date).strftime('%Y-%m-%d') if internal_date else 'Unknown'
 
-    return {"content": full_content[:4000], "date": email_date}
\ No newline at end of file
+    return {"content": full_content[:4000], "date": email_date}
+
+
+# Gmail's HTTP batch endpoint accepts up to 100 sub-requests per round trip
+BATCH_SIZE = 100
+
+def _chunked(ids, size=BATCH_SIZE):
+    for i in range(0, len(ids), size):
+        yield ids[i:i + size]
+
+
+def fetch_snippets_batch(message_ids):
+    """Fetch snippets for many message IDs via batched requests.
+
+    One HTTP round trip covers up to 100 messages instead of one call per
+    message. Returns {message_id: snippet}; failed sub-requests are skipped
+    with a warning.
+    """
+    service = get_gmail_service()
+    snippets = {}
+
+    def collect(request_id, response, exception):
+        if exception is not None:
+            print(f"Warning: snippet fetch failed for {request_id}: {exception}")
+            return
+        snippets[request_id] = response.get('snippet', '')
+
+    for chunk in _chunked(list(message_ids)):
+        batch = service.new_batch_http_request(callback=collect)
+        for msg_id in chunk:
+            batch.add(
+                service.users().messages().get(userId='me', id=msg_id, format='minimal'),
+                request_id=msg_id
+            )
+        batch.execute()
+    return snippets
+
+
+def fetch_contents_batch(message_ids):
+    """Fetch full contents for many message IDs via batched requests.
+
+    Returns {message_id: {"content": ..., "date": ...}}; failed sub-requests
+    are skipped with a warning.
+    """
+    service = get_gmail_service()
+    contents = {}
+
+    def collect(request_id, response, exception):
+        if exception is not None:
+            print(f"Warning: content fetch failed for {request_id}: {exception}")
+            return
+        contents[request_id] = _extract_content(response)
+
+    for chunk in _chunked(list(message_ids)):
+        batch = service.new_batch_http_request(callback=collect)
+        for msg_id in chunk:
+            batch.add(
+                service.users().messages().get(userId='me', id=msg_id, format='full'),
+                request_id=msg_id
+            )
+        batch.execute()
+    return contents
\ No newline at end of file
@@ -1,60 +1,319 @@
 # scripts/process_emails.py
+import asyncio
+import atexit
+import functools
+import hashlib
 import os
-from dotenv import load_dotenv
-import openai
+import random
+import re
+import time
+from contextlib import asynccontextmanager
+import numpy as np
+import orjson
 
-load_dotenv(dotenv_path='config/.env')
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-if not OPENAI_API_KEY:
-    raise ValueError("OpenAI API key not found. Please set OPENAI_API_KEY in your .env file.")
 
-openai.api_key = OPENAI_API_KEY
+@functools.cache
+def _openai():
+    """Import and configure the OpenAI SDK on first use.
 
-# Optional: allow custom OpenAI-compatible endpoint and model via env
-OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL")
-if OPENAI_BASE_URL:
-    openai.api_base = OPENAI_BASE_URL
-OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
+    Importing openai (and loading dotenv behind it) costs a noticeable
+    slice of process startup; deferring it keeps cold starts fast for
+    callers that only need the local predicates and constants.
+    """
+    import openai
+    from dotenv import load_dotenv
+
+    load_dotenv(dotenv_path='config/.env')
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("OpenAI API key not found. Please set OPENAI_API_KEY in your .env file.")
+    openai.api_key = api_key
+    # Optional: allow custom OpenAI-compatible endpoint via env
+    base_url = os.getenv("OPENAI_BASE_URL")
+    if base_url:
+        openai.api_base = base_url
+    return openai
+
+# Persistent response cache so re-runs and duplicate emails skip the API
+# round trip entirely. Keys include the model and a prompt version, so
+# editing either prompt invalidates old entries by bumping PROMPT_VERSION.
+PROMPT_VERSION = "1"
+_CACHE_PATH = "data/llm_cache.json"
+# Append-only log beside the consolidated file, in the style of the
+# checkpoint logs in main.py: each insert costs one appended line instead
+# of a rewrite of the whole growing cache. Folded back into _CACHE_PATH
+# at interpreter exit.
+_CACHE_LOG = "data/llm_cache.jsonl"
+
+def _load_llm_cache():
+    try:
+        with open(_CACHE_PATH, 'rb') as f:
+            cache = orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
+        cache = {}
+    # Replay inserts appended since the last compaction
+    try:
+        with open(_CACHE_LOG, 'rb') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    key, value = orjson.loads(line)
+                except (orjson.JSONDecodeError, ValueError):
+                    # A torn final line after a crash is expected; skip it
+                    continue
+                cache[key] = value
+    except OSError:
+        pass
+    return cache
+
+_llm_cache = _load_llm_cache()
+
+def _cache_key(kind, text):
+    # Collapse whitespace before hashing so reflowed copies of the same
+    # email (forwards, different quoting) still hit the cache
+    digest = hashlib.blake2b(' '.join(text.split()).encode(), digest_size=16).hexdigest()
+    return f"{kind}:gpt-4o-mini:{PROMPT_VERSION}:{digest}"
+
+def _cache_store(key, value):
+    # Rewriting the full cache per insert was O(N^2) bytes over a backfill
+    # and ran synchronously under the event loop; the append is constant
+    _llm_cache[key] = value
+    os.makedirs(os.path.dirname(_CACHE_LOG), exist_ok=True)
+    with open(_CACHE_LOG, 'ab') as f:
+        f.write(orjson.dumps([key, value]) + b"\n")
+
+@atexit.register
+def _compact_llm_cache():
+    """Fold the append log into the consolidated cache file and clear it."""
+    if not os.path.exists(_CACHE_LOG):
+        return
+    os.makedirs(os.path.dirname(_CACHE_PATH), exist_ok=True)
+    with open(_CACHE_PATH, 'wb') as f:
+        f.write(orjson.dumps(_llm_cache))
+    os.remove(_CACHE_LOG)
 
 # Heuristic blacklist to reject non-application content early
-BLACKLIST_KEYWORDS = [
+BLACKLIST_KEYWORDS = (
     "job alert", "jobs for you", "recommended jobs", "recommend jobs", "new jobs",
     "newsletter", "digest", "weekly update", "career tips", "invitation to apply",
     "hot jobs", "top jobs", "trending jobs", "hiring now",
     "subscribe", "unsubscribe", "marketing"
     # 已移除求职平台关键词，以便处理来自这些平台的申请邮件
-]
+)
+
+# Phrases that strongly indicate a rejection email; shared by the snippet
+# filter and the full classifier
+REJECTION_INDICATORS = (
+    "decided to move forward with other candidates",
+    "move forward with other candidates",
+    "not selected", "not moving forward", "regret to inform",
+    "application against the selection criteria",
+    "thank you for taking the time to apply",
+    "encourage you to apply to future opportunities"
+)
+
+def _phrase_re(phrases):
+    """One word-bounded alternation: a single C-level scan per check, and the
+    \b fencing avoids substring hits like 'test' inside 'latest'."""
+    return re.compile(r'\b(?:' + '|'.join(re.escape(p) for p in phrases) + r')\b')
+
+BLACKLIST_RE = _phrase_re(BLACKLIST_KEYWORDS)
+REJECTION_RE = _phrase_re(REJECTION_INDICATORS)
 
-ALLOWED_STATUSES = {"applied", "assessment", "interviewed", "offer", "declined"}
+ALLOWED_STATUSES = frozenset({"applied", "assessment", "interviewed", "offer", "declined"})
+
+_CLASSIFY_PROMPT = (
+    "You are an expert at analyzing job application emails. "
+    "If the email is not clearly about a real application process (submission received, interview, assessment, offer, rejection), "
+    "set status to 'not_application'. Do NOT treat job alerts, recommended jobs, newsletters, or invitations to apply as job application emails. "
+    "Otherwise fill in company, job_title, location and status. "
+    "IMPORTANT: \n"
+    "- For rejection emails, always use status Declined\n"
+    "- Extract the FULL job title including all parenthetical information, department details, program years, degree requirements, etc.\n"
+    "- Example: 'Data Scientist Intern (TikTok-Business Risk Integrated Control-Risk Measurement) - 2026 Summer (BS/MS)' not just 'Data Scientist Intern'\n"
+)
+
+# Structured output schema for the single-email path: the model can only
+# return valid JSON with an in-enum status, so formatting drift and the
+# unparseable-text failure mode disappear
+_CLASSIFY_SCHEMA = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "job_application",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "company": {"type": "string"},
+                "job_title": {"type": "string"},
+                "location": {"type": "string"},
+                "status": {
+                    "type": "string",
+                    "enum": ["Applied", "Assessment", "Interviewed", "Offer",
+                             "Declined", "not_application"],
+                },
+            },
+            "required": ["company", "job_title", "location", "status"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+def _render_classification(data):
+    """Render a schema-validated JSON result into the canonical text block
+    that the cache, validation and detail parsing consume."""
+    if data["status"] == "not_application":
+        return "Not Job Application"
+    return (
+        f"Company: {data['company']}\n"
+        f"Job Title: {data['job_title']}\n"
+        f"Location: {data['location']}\n"
+        f"Status: {data['status']}"
+    )
+
+@asynccontextmanager
+async def _shared_openai_session():
+    """Share one aiohttp session (and its HTTPS connection pool) across all
+    concurrent calls; the 0.28 client otherwise opens a session per request."""
+    import aiohttp
+
+    openai = _openai()
+    session = aiohttp.ClientSession()
+    openai.aiosession.set(session)
+    try:
+        yield
+    finally:
+        openai.aiosession.set(None)
+        await session.close()
+
+async def _chat_with_backoff(**kwargs):
+    """Call ChatCompletion.acreate, retrying rate limits with jittered
+    exponential backoff instead of fixed sleeps between every request."""
+    openai = _openai()
+    delay = 1.0
+    for attempt in range(6):
+        try:
+            return await openai.ChatCompletion.acreate(**kwargs)
+        except openai.error.RateLimitError:
+            if attempt == 5:
+                raise
+            await asyncio.sleep(delay + random.uniform(0, delay))
+            delay = min(delay * 2, 60.0)
 
 def _looks_like_non_application(text: str) -> bool:
-    t = (text or "").lower()
-    return any(kw in t for kw in BLACKLIST_KEYWORDS)
+    if not text:
+        return False
+    return BLACKLIST_RE.search(text.lower()) is not None
 
-def is_job_application(snippet):
+# How many snippets share one filter request; the ~200 fixed prompt tokens
+# are amortized across the window
+FILTER_BATCH_SIZE = 10
+
+_BATCH_FILTER_PROMPT = (
+    "You are a filter for job application emails. You will receive a JSON object "
+    '{"emails": [{"index": <int>, "text": <snippet>}, ...]}. For each email decide '
+    "whether the text indicates real job application progress (application "
+    "submitted/received, interview, assessment, coding challenge, online test, offer, "
+    "or rejection). Assessment invitations, technical tests and follow-up "
+    "communications from companies count as job applications, and so do rejection "
+    "emails. Job alerts, recommended jobs, newsletters, invitations to apply and "
+    "marketing content do not. Return a JSON object "
+    '{"results": [{"index": <int>, "is_application": true|false}, ...]} '
+    "covering every input index."
+)
+
+async def filter_snippets_batch(snippets, concurrency=8):
+    """Decide is-job-application for many snippets with batched requests.
+
+    Local heuristics and the disk cache answer what they can; the remainder
+    go to the API FILTER_BATCH_SIZE at a time, one request per window
+    instead of one per email. Returns a list of booleans aligned with
+    `snippets`.
+    """
+    verdicts = [None] * len(snippets)
+    pending = []
+    for i, snippet in enumerate(snippets):
+        lower = (snippet or "").lower()
+        if REJECTION_RE.search(lower):
+            verdicts[i] = True
+        elif BLACKLIST_RE.search(lower):
+            verdicts[i] = False
+        else:
+            cached = _llm_cache.get(_cache_key("filter", snippet))
+            if cached is not None:
+                verdicts[i] = cached
+            else:
+                pending.append(i)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def classify_window(window):
+        payload = orjson.dumps(
+            {"emails": [{"index": i, "text": snippets[i]} for i in window]}
+        ).decode()
+        async with semaphore:
+            response = await _chat_with_backoff(
+                model="gpt-4o-mini",
+                temperature=0,
+                response_format={"type": "json_object"},
+                messages=[
+                    {"role": "system", "content": _BATCH_FILTER_PROMPT},
+                    {"role": "user", "content": payload}
+                ]
+            )
+        try:
+            results = orjson.loads(response.choices[0].message.content)["results"]
+        except (orjson.JSONDecodeError, KeyError, IndexError, AttributeError, TypeError) as e:
+            print(f"Error parsing batch filter response: {e}")
+            results = []
+        answered = {item.get("index"): bool(item.get("is_application")) for item in results}
+        for i in window:
+            if i in answered:
+                verdicts[i] = answered[i]
+                _cache_store(_cache_key("filter", snippets[i]), answered[i])
+        # Indexes the response dropped or garbled are transient defects;
+        # re-ask for those snippets individually instead of caching a
+        # guessed False that would stick across every future run
+        for i in window:
+            if verdicts[i] is None:
+                async with semaphore:
+                    verdicts[i] = await is_job_application(snippets[i])
+
+    windows = [pending[start:start + FILTER_BATCH_SIZE]
+               for start in range(0, len(pending), FILTER_BATCH_SIZE)]
+    if windows:
+        async with _shared_openai_session():
+            await asyncio.gather(*(classify_window(w) for w in windows))
+    return verdicts
+
+# Gmail snippets are usually short, but cap what we send anyway: the first
+# few hundred characters carry the signal, and the Yes/No answer needs only
+# a single completion token
+FILTER_SNIPPET_CHARS = 400
+
+async def is_job_application(snippet):
     """Quick check if email is job application-related using snippet."""
+    snippet = (snippet or "")[:FILTER_SNIPPET_CHARS]
     # Enhanced local pattern matching for common rejection phrases - CHECK THIS FIRST
-    snippet_lower = snippet.lower()
-    rejection_indicators = [
-        "decided to move forward with other candidates",
-        "move forward with other candidates", 
-        "not selected", "not moving forward", "regret to inform",
-        "application against the selection criteria",
-        "thank you for taking the time to apply",
-        "encourage you to apply to future opportunities"
-    ]
-    
     # If we detect clear rejection language, it's definitely a job application
-    if any(phrase in snippet_lower for phrase in rejection_indicators):
+    if REJECTION_RE.search(snippet.lower()):
         return True
     
     # Fast heuristic rejection - only after checking for rejection emails
     if _looks_like_non_application(snippet):
         return False
     
-    response = openai.ChatCompletion.create(
+    key = _cache_key("filter", snippet)
+    cached = _llm_cache.get(key)
+    if cached is not None:
+        return cached
+    
+    response = await _chat_with_backoff(
         model="gpt-4o-mini",
         temperature=0,
+        max_tokens=1,
         messages=[
             {
                 "role": "system",
@@ -70,67 +329,552 @@ def is_job_application(snippet):
             {"role": "user", "content": snippet}
         ]
     )
-    return response.choices[0].message.content.strip().lower() == 'yes'
+    verdict = response.choices[0].message.content.strip().lower() == 'yes'
+    _cache_store(key, verdict)
+    return verdict
+
+# How much of the body the classifier actually needs: the opening of the
+# primary text carries the decision, while quoted history, signatures and
+# legal footers only add tokens
+SALIENT_BODY_CHARS = 800
 
-def classify_email(email_content):
+_QUOTED_LINE_RE = re.compile(r'^>.*$\n?', re.MULTILINE)
+_SIGNATURE_DELIM_RE = re.compile(r'^-- $', re.MULTILINE)
+
+def _extract_salient(email_content):
+    """Reduce an email to its From/Subject lines plus the start of the
+    primary body.
+
+    Token cost is roughly linear in input length, so trimming a 10KB
+    thread with quoted history down to ~1KB is a direct cost and latency
+    cut on the API-bound path; the smaller text also makes cache keys
+    insensitive to trailing noise.
+    """
+    header, sep, body = email_content.partition('\n\n')
+    if not sep:
+        return email_content[:SALIENT_BODY_CHARS]
+    body = _QUOTED_LINE_RE.sub('', body)
+    body = _SIGNATURE_DELIM_RE.split(body, 1)[0]
+    return f"{header}\n\n{body.strip()[:SALIENT_BODY_CHARS]}"
+
+async def classify_email(email_content):
     """Extract details from full email content."""
+    email_content = _extract_salient(email_content)
     # Check for rejection emails first - they should always be processed
-    content_lower = email_content.lower()
-    rejection_indicators = [
-        "decided to move forward with other candidates",
-        "move forward with other candidates", 
-        "not selected", "not moving forward", "regret to inform",
-        "application against the selection criteria",
-        "thank you for taking the time to apply",
-        "encourage you to apply to future opportunities"
-    ]
-    
-    is_rejection = any(phrase in content_lower for phrase in rejection_indicators)
+    is_rejection = REJECTION_RE.search(email_content.lower()) is not None
     
     # Reject obvious non-application emails (but not if it's a rejection email)
     if not is_rejection and _looks_like_non_application(email_content):
         return "Not Job Application"
+
+    # Known ATS senders classify from sender + status phrase alone
+    ruled = _rule_classify(email_content)
+    if ruled is not None:
+        return ruled
+
+    key = _cache_key("classify", email_content)
+    classification = _llm_cache.get(key)
+    if classification is None:
+        response = await _chat_with_backoff(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": _CLASSIFY_PROMPT},
+                {"role": "user", "content": email_content}
+            ],
+            max_tokens=150,
+            temperature=0,
+            response_format=_CLASSIFY_SCHEMA
+        )
+        classification = _render_classification(
+            orjson.loads(response.choices[0].message.content)
+        )
+        _cache_store(key, classification)
     
-    system_prompt = (
-        "You are an expert at analyzing job application emails. "
-        "If the email is not clearly about a real application process (submission received, interview, assessment, offer, rejection), "
-        "return exactly: 'Not Job Application'. Do NOT treat job alerts, recommended jobs, newsletters, or invitations to apply as job application emails. "
-        "If it is related, extract fields strictly in this format (Status must be one of Applied, Assessment, Interviewed, Offer, Declined):\n"
-        "Company: [company name]\n"
-        "Job Title: [complete job title with all details, including department, level, program, year, etc.]\n"
-        "Location: [location]\n"
-        "Status: [Applied|Assessment|Interviewed|Offer|Declined]\n"
-        "IMPORTANT: \n"
-        "- For rejection emails, always use Status: Declined\n"
-        "- Extract the FULL job title including all parenthetical information, department details, program years, degree requirements, etc.\n"
-        "- Example: 'Data Scientist Intern (TikTok-Business Risk Integrated Control-Risk Measurement) - 2026 Summer (BS/MS)' not just 'Data Scientist Intern'\n"
+    return _validate_classification(classification)
+
+
+def _validate_classification(classification):
+    """Post-validate one classification block; shared by the single and
+    batched paths. Every caller has already run the blacklist gate on the
+    email itself, so only the block's shape is checked here."""
+    if not classification.startswith("Company:"):
+        return "Not Job Application"
+    # One early-exit scan for the Status line instead of parsing every
+    # line into a dict
+    for line in classification.splitlines():
+        if line.startswith("Status:"):
+            if line.split(":", 1)[1].strip().lower() not in ALLOWED_STATUSES:
+                return "Not Job Application"
+            break
+    else:
+        return "Not Job Application"
+    return classification
+
+
+# Batched classification: several emails share one request and its fixed
+# system prompt. Window size is capped by count and by characters (emails
+# are already truncated to 4000 chars; ~4 chars/token keeps a full window
+# far below the context limit).
+CLASSIFY_BATCH_SIZE = 10
+CLASSIFY_BATCH_CHAR_BUDGET = 30000
+
+_BLOCK_INDEX_RE = re.compile(r'\[(\d+)\]\s*')
+
+# Semantic near-duplicate cache: ATS template emails (Greenhouse, Workday...)
+# differ only by company and title, so a high-cosine embedding match lets us
+# reuse a cached classification with the fresh sender's company substituted
+# in, skipping the chat call entirely. Stored vectors are normalized, so one
+# numpy dot product is the same exact inner-product search FAISS's
+# IndexFlatIP would do at this scale.
+SEMANTIC_CACHE_THRESHOLD = 0.95
+_SEMANTIC_CACHE_PATH = "data/llm_semantic_cache.json"
+# New templates append one [vector, classification] line here rather than
+# rewriting the whole matrix per insert; compacted at exit like the
+# response cache
+_SEMANTIC_CACHE_LOG = "data/llm_semantic_cache.jsonl"
+
+def _load_semantic_cache():
+    try:
+        with open(_SEMANTIC_CACHE_PATH, 'rb') as f:
+            raw = orjson.loads(f.read())
+        vectors = list(raw.get("vectors", []))
+        classifications = list(raw.get("classifications", []))
+    except (OSError, orjson.JSONDecodeError):
+        vectors, classifications = [], []
+    try:
+        with open(_SEMANTIC_CACHE_LOG, 'rb') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    vec, classification = orjson.loads(line)
+                except (orjson.JSONDecodeError, ValueError):
+                    continue
+                vectors.append(vec)
+                classifications.append(classification)
+    except OSError:
+        pass
+    if not vectors:
+        return np.empty((0, 0), dtype=np.float32), classifications
+    return np.asarray(vectors, dtype=np.float32), classifications
+
+_sem_vectors, _sem_classifications = _load_semantic_cache()
+
+def _semantic_cache_match(vec):
+    if _sem_vectors.size == 0:
+        return None
+    scores = _sem_vectors @ vec
+    best = int(np.argmax(scores))
+    if scores[best] >= SEMANTIC_CACHE_THRESHOLD:
+        return _sem_classifications[best]
+    return None
+
+def _semantic_cache_add(vec, classification):
+    global _sem_vectors
+    _sem_vectors = (np.vstack([_sem_vectors, vec[None, :]])
+                    if _sem_vectors.size else vec[None, :].copy())
+    _sem_classifications.append(classification)
+    os.makedirs(os.path.dirname(_SEMANTIC_CACHE_LOG), exist_ok=True)
+    with open(_SEMANTIC_CACHE_LOG, 'ab') as f:
+        f.write(orjson.dumps([vec, classification],
+                             option=orjson.OPT_SERIALIZE_NUMPY) + b"\n")
+
+@atexit.register
+def _compact_semantic_cache():
+    """Fold appended templates into the consolidated file and clear the log."""
+    if not os.path.exists(_SEMANTIC_CACHE_LOG):
+        return
+    os.makedirs(os.path.dirname(_SEMANTIC_CACHE_PATH), exist_ok=True)
+    with open(_SEMANTIC_CACHE_PATH, 'wb') as f:
+        f.write(orjson.dumps(
+            {"vectors": _sem_vectors, "classifications": _sem_classifications},
+            option=orjson.OPT_SERIALIZE_NUMPY
+        ))
+    os.remove(_SEMANTIC_CACHE_LOG)
+
+async def _embed_texts(texts):
+    """Batch-embed texts with text-embedding-3-small, L2-normalized."""
+    response = await _openai().Embedding.acreate(
+        model="text-embedding-3-small",
+        input=[' '.join(t.split())[:8000] for t in texts]
     )
-    
-    response = openai.ChatCompletion.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": email_content}
-        ],
-        max_tokens=150,
-        temperature=0
+    vecs = np.asarray([item["embedding"] for item in response["data"]], dtype=np.float32)
+    norms = np.linalg.norm(vecs, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vecs / norms
+
+_FROM_LINE_RE = re.compile(r'^From:\s*(.*)$', re.MULTILINE)
+_SENDER_NAME_RE = re.compile(r'\s*"?([^"<@]+?)"?\s*<')
+_SENDER_DOMAIN_RE = re.compile(r'@([A-Za-z0-9-]+)\.')
+_SUBJECT_LINE_RE = re.compile(r'^Subject:\s*(.*)$', re.MULTILINE)
+# 'application for <title> (position/role) (at <company>)' subject shapes;
+# deliberately not matching 'application to <X>', where X is the company
+_SUBJECT_TITLE_RE = re.compile(
+    r'\bappl(?:ication|ied|ying)\s+for\s+(?:the\s+)?(.+?)'
+    r'(?:\s+(?:position|role|opening))?(?:\s+at\s+\S.*)?\s*$',
+    re.IGNORECASE
+)
+# ATS display names read "Acme Careers" / "Acme Recruiting Team"; strip the
+# boilerplate tail so the Company field is just the employer
+_COMPANY_NOISE_RE = re.compile(
+    r'\s*\b(?:careers?|recruiting|recruitment|talent(?: acquisition)?|hiring|team|no[- ]?reply)\b\s*$',
+    re.IGNORECASE
+)
+
+def _clean_company(name):
+    """Strip recruiting boilerplate off a sender display name."""
+    while True:
+        stripped = _COMPANY_NOISE_RE.sub('', name).strip()
+        if stripped == name:
+            return name
+        name = stripped
+
+def _template_fill(cached_classification, email_content):
+    """Reuse a near-duplicate's classification for a fresh email.
+
+    Templates that clear the similarity bar can still differ by employer
+    and role, so both are re-extracted from the fresh email - company
+    from the From header, title from the Subject line - and substituted
+    into the cached block. If either can't be extracted, return None and
+    let the LLM handle it.
+    """
+    if cached_classification == "Not Job Application":
+        return cached_classification
+    if not cached_classification.startswith("Company:"):
+        return None
+    from_match = _FROM_LINE_RE.search(email_content)
+    if not from_match:
+        return None
+    sender = from_match.group(1)
+    name_match = _SENDER_NAME_RE.match(sender)
+    if name_match:
+        company = _clean_company(name_match.group(1).strip())
+    else:
+        domain_match = _SENDER_DOMAIN_RE.search(sender)
+        if not domain_match:
+            return None
+        company = domain_match.group(1).capitalize()
+    if not company:
+        return None
+    subject_match = _SUBJECT_LINE_RE.search(email_content)
+    title_match = _SUBJECT_TITLE_RE.search(subject_match.group(1)) if subject_match else None
+    if not title_match:
+        return None
+    title = title_match.group(1).strip()
+    if not title:
+        return None
+    filled = re.sub(r'(?m)^Company:.*$', f'Company: {company}',
+                    cached_classification, count=1)
+    return re.sub(r'(?m)^Job Title:.*$', f'Job Title: {title}',
+                  filled, count=1)
+
+# Hand-written shortcut rules for the big ATS senders. Mail from these
+# domains is template-generated, so sender domain + one status phrase
+# classifies it with a dict lookup and a regex instead of an LLM call.
+# Patterns are tried in order; rejection language wins over anything else.
+_ATS_STATUS_RULES = (
+    (re.compile(r'unfortunately|not (?:be )?moving forward|other candidates|regret to inform'
+                r'|unable to offer|cannot offer|not selected|(?:position|role) has been filled'
+                r'|no longer considering'), "Declined"),
+    (re.compile(r'\boffer\b'), "Offer"),
+    (re.compile(r'\binterview\b'), "Interviewed"),
+    (re.compile(r'assessment|coding challenge|online test|hackerrank|codesignal'), "Assessment"),
+    (re.compile(r'(?:received|submitted) your application|application (?:was |has been )?(?:received|submitted)|thank you for applying'), "Applied"),
+)
+
+SENDER_RULES = {
+    "greenhouse.io": _ATS_STATUS_RULES,
+    "greenhouse-mail.io": _ATS_STATUS_RULES,
+    "myworkday.com": _ATS_STATUS_RULES,
+    "smartrecruiters.com": _ATS_STATUS_RULES,
+    "lever.co": _ATS_STATUS_RULES,
+    "icims.com": _ATS_STATUS_RULES,
+    "ashbyhq.com": _ATS_STATUS_RULES,
+}
+
+_SENDER_FULL_DOMAIN_RE = re.compile(r'@([A-Za-z0-9.-]+)')
+
+def _rule_classify(email_content):
+    """Classify template mail from known ATS senders without the LLM.
+
+    Returns a canonical classification block when the sender domain is in
+    SENDER_RULES, a status phrase matches, and the company and job title
+    are extractable from the sender display name and Subject line; None
+    lets the caller fall through to the cache/LLM path.
+    """
+    from_match = _FROM_LINE_RE.search(email_content)
+    if not from_match:
+        return None
+    sender = from_match.group(1)
+    domain_match = _SENDER_FULL_DOMAIN_RE.search(sender)
+    if not domain_match:
+        return None
+    domain = domain_match.group(1).lower()
+    rules = next(
+        (r for d, r in SENDER_RULES.items() if domain == d or domain.endswith('.' + d)),
+        None
     )
-    
-    try:
-        classification = response.choices[0].message.content.strip()
-        if not classification.startswith("Company:"):
-            return "Not Job Application"
-        
-        # Post validation
-        lines = {k.strip().lower(): v.strip() for k, v in (line.split(":", 1) for line in classification.splitlines() if ":" in line)}
-        status_val = (lines.get("status", "").strip() or "").lower()
-        
-        if status_val not in ALLOWED_STATUSES:
-            return "Not Job Application"
-        # Don't do blacklist check again if we already determined this is a rejection email
-        if not is_rejection and _looks_like_non_application(email_content):
-            return "Not Job Application"
-        return classification
-    except (IndexError, AttributeError, KeyError) as e:
-        print(f"Error processing OpenAI response: {e}")
-        return "Not Job Application"
+    if rules is None:
+        return None
+    name_match = _SENDER_NAME_RE.match(sender)
+    if not name_match:
+        return None
+    company = _clean_company(name_match.group(1).strip())
+    if not company:
+        return None
+    # Without a recoverable title the shortcut would record 'Unknown' and
+    # collapse every role at the company into one dedupe bucket; let the
+    # LLM extract it instead
+    subject_match = _SUBJECT_LINE_RE.search(email_content)
+    title_match = _SUBJECT_TITLE_RE.search(subject_match.group(1)) if subject_match else None
+    if not title_match:
+        return None
+    title = title_match.group(1).strip()
+    if not title:
+        return None
+    lower = email_content.lower()
+    for pattern, status in rules:
+        if pattern.search(lower):
+            return (f"Company: {company}\nJob Title: {title}\n"
+                    f"Location: Unknown\nStatus: {status}")
+    return None
+
+_BATCH_CLASSIFY_PROMPT = (
+    "You are an expert at analyzing job application emails. You will receive several "
+    "emails, each introduced by a line '[i]' (its number) and separated by lines of '---'. "
+    "Analyze each email independently under the following rules. "
+    "If the email is not clearly about a real application process (submission received, interview, assessment, offer, rejection), "
+    "the result for it is exactly: 'Not Job Application'. Do NOT treat job alerts, recommended jobs, newsletters, or invitations to apply as job application emails. "
+    "If it is related, extract fields strictly in this format (Status must be one of Applied, Assessment, Interviewed, Offer, Declined):\n"
+    "Company: [company name]\n"
+    "Job Title: [complete job title with all details, including department, level, program, year, etc.]\n"
+    "Location: [location]\n"
+    "Status: [Applied|Assessment|Interviewed|Offer|Declined]\n"
+    "IMPORTANT: \n"
+    "- For rejection emails, always use Status: Declined\n"
+    "- Extract the FULL job title including all parenthetical information, department details, program years, degree requirements, etc.\n"
+    "Output one block per email: the line '[i]' matching the email's number, then its "
+    "result, with blocks separated by lines of '==='. Cover every input number."
+)
+
+async def classify_emails_batch(email_contents, concurrency=8):
+    """Classify many emails, several per API request.
+
+    The free heuristics and the disk cache answer what they can; the rest
+    are packed into numbered windows so the system prompt is paid once per
+    window instead of once per email. Any email whose block cannot be
+    parsed out of the batched response falls back to a per-email
+    classify_email call. Returns a list aligned with `email_contents`.
+    """
+    email_contents = [_extract_salient(c) for c in email_contents]
+    results = [None] * len(email_contents)
+    pending = []
+    for i, content in enumerate(email_contents):
+        is_rejection = REJECTION_RE.search(content.lower()) is not None
+        if not is_rejection and _looks_like_non_application(content):
+            results[i] = "Not Job Application"
+            continue
+        ruled = _rule_classify(content)
+        if ruled is not None:
+            results[i] = ruled
+            continue
+        cached = _llm_cache.get(_cache_key("classify", content))
+        if cached is not None:
+            results[i] = _validate_classification(cached)
+        else:
+            pending.append(i)
+
+    # Semantic layer: one batched embedding call, then reuse classifications
+    # of near-identical ATS templates where the guard allows it
+    miss_vectors = {}
+    if pending:
+        try:
+            vectors = await _embed_texts([email_contents[i] for i in pending])
+        except Exception as e:
+            print(f"Embedding lookup failed; skipping semantic cache: {e}")
+            vectors = None
+        if vectors is not None:
+            still_pending = []
+            for row, i in enumerate(pending):
+                hit = _semantic_cache_match(vectors[row])
+                filled = _template_fill(hit, email_contents[i]) if hit is not None else None
+                if filled is not None:
+                    results[i] = _validate_classification(filled)
+                else:
+                    miss_vectors[i] = vectors[row]
+                    still_pending.append(i)
+            pending = still_pending
+
+    windows = []
+    window, used = [], 0
+    for i in pending:
+        size = len(email_contents[i])
+        if window and (len(window) >= CLASSIFY_BATCH_SIZE
+                       or used + size > CLASSIFY_BATCH_CHAR_BUDGET):
+            windows.append(window)
+            window, used = [], 0
+        window.append(i)
+        used += size
+    if window:
+        windows.append(window)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def classify_window(window):
+        user_message = "\n---\n".join(f"[{i}]\n{email_contents[i]}" for i in window)
+        async with semaphore:
+            response = await _chat_with_backoff(
+                model="gpt-4o-mini",
+                messages=[
+                    {"role": "system", "content": _BATCH_CLASSIFY_PROMPT},
+                    {"role": "user", "content": user_message}
+                ],
+                max_tokens=150 * len(window),
+                temperature=0
+            )
+        try:
+            text = response.choices[0].message.content
+        except (IndexError, AttributeError, KeyError) as e:
+            print(f"Error processing batched OpenAI response: {e}")
+            text = None
+        answered = {}
+        if text:
+            for block in text.split('==='):
+                block = block.strip()
+                match = _BLOCK_INDEX_RE.match(block)
+                if match:
+                    answered[int(match.group(1))] = block[match.end():].strip()
+        for i in window:
+            block = answered.get(i)
+            if block is None:
+                # Unparseable or missing block: per-email fallback
+                results[i] = await classify_email(email_contents[i])
+                continue
+            _cache_store(_cache_key("classify", email_contents[i]), block)
+            if i in miss_vectors:
+                _semantic_cache_add(miss_vectors[i], block)
+            results[i] = _validate_classification(block)
+
+    if windows:
+        async with _shared_openai_session():
+            await asyncio.gather(*(classify_window(w) for w in windows))
+    return results
+
+
+# OpenAI Batch API path for non-interactive backfills: half the token price,
+# a separate rate-limit pool, and a 24h completion window. The pinned 0.28
+# SDK predates the Batch resource, so the three REST calls go through
+# requests (already a dependency of openai itself).
+@functools.cache
+def _openai_api_base():
+    return (_openai().api_base or "https://api.openai.com/v1").rstrip('/')
+
+def classify_emails_batch_api(email_contents, poll_interval=60):
+    """Classify emails through the OpenAI Batch API.
+
+    Uploads one JSONL request per email, waits for the batch to finish
+    (which may take hours), and returns results aligned with
+    `email_contents`. Meant for large historical backfills where cost and
+    rate limits matter more than wall-clock time; entries the batch fails
+    to answer fall back to the interactive batched path.
+    """
+    import requests
+
+    email_contents = [_extract_salient(c) for c in email_contents]
+    results = [None] * len(email_contents)
+    pending = []
+    for i, content in enumerate(email_contents):
+        is_rejection = REJECTION_RE.search(content.lower()) is not None
+        if not is_rejection and _looks_like_non_application(content):
+            results[i] = "Not Job Application"
+            continue
+        ruled = _rule_classify(content)
+        if ruled is not None:
+            results[i] = ruled
+            continue
+        cached = _llm_cache.get(_cache_key("classify", content))
+        if cached is not None:
+            results[i] = _validate_classification(cached)
+        else:
+            pending.append(i)
+
+    answered = {}
+    if pending:
+        headers = {"Authorization": f"Bearer {_openai().api_key}"}
+        lines = [
+            orjson.dumps({
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": "gpt-4o-mini",
+                    "messages": [
+                        {"role": "system", "content": _CLASSIFY_PROMPT},
+                        {"role": "user", "content": email_contents[i]}
+                    ],
+                    "max_tokens": 150,
+                    "temperature": 0,
+                    "response_format": _CLASSIFY_SCHEMA
+                }
+            })
+            for i in pending
+        ]
+        upload = requests.post(
+            f"{_openai_api_base()}/files",
+            headers=headers,
+            files={"file": ("classify_batch.jsonl", b"\n".join(lines))},
+            data={"purpose": "batch"}
+        )
+        upload.raise_for_status()
+        batch = requests.post(
+            f"{_openai_api_base()}/batches",
+            headers=headers,
+            json={
+                "input_file_id": upload.json()["id"],
+                "endpoint": "/v1/chat/completions",
+                "completion_window": "24h"
+            }
+        )
+        batch.raise_for_status()
+        batch_id = batch.json()["id"]
+        print(f"Submitted batch {batch_id} with {len(pending)} emails; polling...")
+
+        while True:
+            status = requests.get(f"{_openai_api_base()}/batches/{batch_id}", headers=headers).json()
+            if status.get("status") in ("completed", "failed", "expired", "cancelled"):
+                break
+            time.sleep(poll_interval)
+
+        output_file_id = status.get("output_file_id")
+        if status.get("status") == "completed" and output_file_id:
+            output = requests.get(f"{_openai_api_base()}/files/{output_file_id}/content", headers=headers)
+            output.raise_for_status()
+            for line in output.content.splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    entry = orjson.loads(line)
+                    idx = int(entry["custom_id"])
+                    text = entry["response"]["body"]["choices"][0]["message"]["content"].strip()
+                    block = _render_classification(orjson.loads(text))
+                except (orjson.JSONDecodeError, KeyError, IndexError, TypeError, ValueError):
+                    continue
+                answered[idx] = block
+        else:
+            print(f"Batch {batch_id} ended with status {status.get('status')}")
+
+    for i in pending:
+        text = answered.get(i)
+        if text is None:
+            continue
+        _cache_store(_cache_key("classify", email_contents[i]), text)
+        results[i] = _validate_classification(text)
+
+    missing = [i for i in pending if results[i] is None]
+    if missing:
+        print(f"Falling back to interactive classification for {len(missing)} emails")
+        fallback = asyncio.run(classify_emails_batch([email_contents[i] for i in missing]))
+        for i, res in zip(missing, fallback):
+            results[i] = res
+    return results